@@ -0,0 +1,109 @@
+"""Chart rendering for the risk and obligation distributions.
+
+Charts are drawn on standalone Agg figures (never registered with pyplot, so nothing keeps them
+alive after rendering) and returned as PNG/SVG bytes. Rendered images are kept in a size-bounded
+LRU keyed by the input counts, so repeat views of the same contract within a process (Streamlit
+reruns, load tests) reuse the bytes instead of drawing again. The cache is in memory only: the
+report exporter runs in its own process and renders afresh, through these same functions.
+"""
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Dict, Optional, Tuple
+
+FORMATS = ("png", "svg")
+DEFAULT_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class ChartCache:
+    """Thread-safe LRU of rendered chart bytes, bounded by total size."""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: tuple, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._items[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._items), "bytes": self._size, "hits": self.hits, "misses": self.misses}
+
+
+CACHE = ChartCache()
+
+
+def _render_bar(counts: Tuple[Tuple[str, int], ...], xlabel: str, ylabel: str, fmt: str) -> bytes:
+    try:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+    except Exception:
+        raise ImportError("matplotlib is required to render charts. Install from requirements.txt")
+    fig = Figure(figsize=(6.4, 4.8))
+    FigureCanvasAgg(fig)
+    try:
+        ax = fig.add_subplot()
+        labels = [k for k, _ in counts]
+        ax.bar(labels, [v for _, v in counts], label="Count")
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.legend()
+        buf = BytesIO()
+        fig.savefig(buf, format=fmt, bbox_inches="tight")
+        return buf.getvalue()
+    finally:
+        fig.clear()
+
+
+def bar_chart(counts: Dict[str, int], xlabel: str, ylabel: str, fmt: str = "png",
+              cache: Optional[ChartCache] = CACHE) -> bytes:
+    """Return a bar chart of `counts` as image bytes, rendering only on a cache miss."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported chart format {fmt!r}; expected one of {FORMATS}")
+    items = tuple((str(k), int(v)) for k, v in counts.items())
+    key = (items, xlabel, ylabel, fmt)
+    if cache is not None:
+        data = cache.get(key)
+        if data is not None:
+            return data
+    data = _render_bar(items, xlabel, ylabel, fmt)
+    if cache is not None:
+        cache.put(key, data)
+    return data
+
+
+def risk_chart(risk_counts: Dict[str, int], fmt: str = "png") -> bytes:
+    return bar_chart(risk_counts, "Risk Level", "Number of Clauses", fmt)
+
+
+def obligation_chart(ob_counts: Dict[str, int], fmt: str = "png") -> bytes:
+    return bar_chart(ob_counts, "Obligation Type", "Count", fmt)
@@ -1,30 +1,26 @@
-from typing import Dict, Tuple
-import re
+from typing import Dict, Optional, Tuple
 
-CONTRACT_KEYWORDS = {
-	"Employment Agreement": ["employee", "employer", "salary", "probation", "notice period", "termination", "joining"],
-	"Vendor/Procurement Contract": ["delivery", "supplier", "vendor", "purchase order", "invoice", "goods", "services provided"],
-	"Lease Agreement": ["lease", "rent", "tenant", "landlord", "premises", "renewal", "security deposit"],
-	"Partnership Deed": ["partners", "partnership", "profit share", "capital contribution", "partner"],
-	"Service Agreement": ["service", "statement of work", "sow", "service level", "sla", "performance"],
-}
+from core.rule_pack import RulePack, active_pack
 
-def classify_contract(text: str) -> Tuple[str, Dict[str, int]]:
+# Keywords per contract type come from the rule pack ("contract_types" in rules/default.json).
+
+def classify_contract(text: str, rules: Optional[RulePack] = None) -> Tuple[str, Dict[str, int]]:
 	"""Return the best-matching contract type and raw keyword hit counts.
 
 	This is a lightweight rule-based classifier suitable for prototyping.
 	"""
+	rules = rules or active_pack()
 	counts: Dict[str, int] = {}
 	norm = text.lower()
-	for label, kws in CONTRACT_KEYWORDS.items():
+	for label, kws in rules.contract_types:
 		c = 0
-		for kw in kws:
+		for kw, boundary in kws:
 			# simple substring match; kw may contain spaces
 			if kw in norm:
 				c += norm.count(kw)
 			else:
 				# also try word-boundary match for single words
-				if re.search(r"\b" + re.escape(kw) + r"\b", norm):
+				if boundary.search(norm):
 					c += 1
 		counts[label] = c
 
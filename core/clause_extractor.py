@@ -1,18 +1,33 @@
-import re
-from typing import List
+from typing import List, Optional
 
-def split_into_clauses(text: str) -> List[str]:
+from core.safe_regex import StageBudget, compile_linear
+
+# The heading split only consumes horizontal whitespace after the newline; allowing `\s*` here
+# let every blank line rescan the rest of a whitespace run (quadratic on OCR output).
+HEADING_SPLIT = r"\n[^\S\n]*(?=(?:\d+\.|\d+\)|Section\s{1,8}\d+|Clause\s{1,8}\d+))"
+PARAGRAPH_SPLIT = r"\n\n+"
+SENTENCE_SPLIT = r"(?<=[.!?])\s+"
+
+
+def split_into_clauses(text: str, budget: Optional[StageBudget] = None) -> List[str]:
+    """Split on headings, then blank lines. Unlimited unless a `budget` is given for the "clauses" stage."""
+    clock = budget.stage("clauses") if budget is not None else None
     # Split on common clause numbering and headings
-    parts = re.split(r"\n\s*(?=(?:\d+\.|\d+\)|Section\s+\d+|Clause\s+\d+))", text)
+    parts = compile_linear(HEADING_SPLIT).split(text)
+    paragraphs = compile_linear(PARAGRAPH_SPLIT)
     clauses = []
-    for p in parts:
+    for i, p in enumerate(parts):
+        if clock is not None and clock.expired():
+            # keep the remaining text as coarse, unsplit chunks
+            clauses.extend(q.strip() for q in parts[i:] if q.strip())
+            break
         p = p.strip()
         if not p:
             continue
         # further split long paragraphs by double newlines
-        sub = [s.strip() for s in re.split(r"\n\n+", p) if s.strip()]
+        sub = [s.strip() for s in paragraphs.split(p) if s.strip()]
         clauses.extend(sub)
     # fallback: if no clauses found, split by sentences
     if not clauses:
-        clauses = [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
+        clauses = [s.strip() for s in compile_linear(SENTENCE_SPLIT).split(text) if s.strip()]
     return clauses
@@ -0,0 +1,290 @@
+"""Columnar (Parquet / Feather) export of clause-level and document-level results.
+
+Rows are produced one document at a time and written to Arrow record batches, so a corpus can
+be exported without ever holding it in memory (or in pandas) as a whole. Parquet output is a
+hive-partitioned dataset that new runs append to as fresh partitions:
+
+    <out_dir>/clauses/batch=<partition>/part-00000.parquet
+    <out_dir>/documents/batch=<partition>/part-00000.parquet
+
+Feather output writes one Arrow IPC file per table per partition for quick local use.
+
+Partitions are written under a `_staging-batch=<partition>` directory (which dataset scans skip)
+and only renamed to `batch=<partition>` on a clean close, so a failed run never leaves a partial
+partition behind.
+"""
+import shutil
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.obligation_detector import label_obligation
+from core.pipeline import analyze_contract
+from core.rule_pack import active_pack
+from core.safe_regex import StageBudget
+
+FORMATS = ("parquet", "feather")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except Exception:
+        raise ImportError("pyarrow is required for columnar export. Install from requirements.txt")
+    return pyarrow
+
+
+def clause_schema():
+    pa = _require_pyarrow()
+    return pa.schema([
+        ("doc_id", pa.string()),
+        ("clause_index", pa.int32()),
+        ("start", pa.int64()),
+        ("end", pa.int64()),
+        ("risk_label", pa.string()),
+        ("severity", pa.float64()),
+        # matched pattern count per risk level, keyed by the rule pack's level names
+        ("level_hits", pa.map_(pa.string(), pa.int16())),
+        ("obligation_label", pa.string()),
+        ("text", pa.string()),
+        ("rule_pack", pa.string()),
+    ])
+
+
+def document_schema():
+    pa = _require_pyarrow()
+    return pa.schema([
+        ("doc_id", pa.string()),
+        ("contract_type", pa.string()),
+        ("type_counts", pa.map_(pa.string(), pa.int32())),
+        ("parties", pa.list_(pa.string())),
+        ("dates", pa.list_(pa.string())),
+        ("amounts", pa.list_(pa.string())),
+        ("jurisdiction", pa.list_(pa.string())),
+        ("num_clauses", pa.int32()),
+        ("composite_score", pa.float64()),
+        ("degraded_stages", pa.list_(pa.string())),
+        ("rule_pack", pa.string()),
+    ])
+
+
+def analyze_document(doc_id: str, text: str) -> Tuple[Dict[str, object], List[Dict[str, object]]]:
+    """Run the shared analysis (core.pipeline) over one document and return (document_row, clause_rows).
+
+    Scores and the composite match what the app and audit log report: only the first
+    `MAX_SCORED_CLAUSES` clauses are scored, and later clauses are exported with null risk
+    columns. Clause offsets are character positions into `text`; they are -1 if the (stripped)
+    clause cannot be located verbatim. Both row kinds carry the rule-pack version they were
+    scored with; stages cut short by their budget are listed in `degraded_stages`.
+    """
+    rules = active_pack()
+    result = analyze_contract(text, rules=rules, budget=StageBudget(), explain=False)
+    entities = result["entities"]
+    scored = result["clauses_with_scores"]
+    scored_reasons = result["clause_reasons"]
+
+    clause_rows: List[Dict[str, object]] = []
+    cursor = 0
+    for i, cl in enumerate(result["clauses"]):
+        start = text.find(cl, cursor)
+        if start == -1:
+            start = text.find(cl)
+        end = start + len(cl) if start != -1 else -1
+        if start != -1:
+            cursor = end
+
+        if i < len(scored):
+            label, reasons = scored[i][1], scored_reasons[i]
+        else:
+            label, reasons = None, {}
+        ob_label, _ = label_obligation(cl, rules)
+        clause_rows.append({
+            "doc_id": doc_id,
+            "clause_index": i,
+            "start": start,
+            "end": end,
+            "risk_label": label,
+            "severity": reasons.get("severity"),
+            "level_hits": [(level, reasons[level]) for level, _ in rules.risk_levels] if reasons else None,
+            "obligation_label": ob_label,
+            "text": cl,
+            "rule_pack": rules.version,
+        })
+
+    doc_row = {
+        "doc_id": doc_id,
+        "contract_type": result["contract_type"],
+        "type_counts": list(result["type_counts"].items()),
+        "parties": entities.get("PARTIES", []),
+        "dates": entities.get("DATES", []),
+        "amounts": entities.get("AMOUNTS", []),
+        "jurisdiction": entities.get("JURISDICTION", []),
+        "num_clauses": result["num_clauses"],
+        "composite_score": result["composite_score"],
+        "degraded_stages": result["degraded_stages"],
+        "rule_pack": rules.version,
+    }
+    return doc_row, clause_rows
+
+
+class _TableSink:
+    """Buffers rows for one table and streams them out as record batches.
+
+    Files are written to `staging_dir` and moved to `final_dir` by `commit()`.
+    """
+
+    def __init__(self, staging_dir: Path, final_dir: Path, filename: str, schema, fmt: str, batch_size: int):
+        self.staging_dir = staging_dir
+        self.final_dir = final_dir
+        self.path = staging_dir / filename
+        self.schema = schema
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.rows: List[Dict[str, object]] = []
+        self.writer = None
+        self.written = 0
+
+    def add(self, rows: Iterable[Dict[str, object]]):
+        self.rows.extend(rows)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def _open(self):
+        pa = _require_pyarrow()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.fmt == "parquet":
+            import pyarrow.parquet as pq
+            self.writer = pq.ParquetWriter(str(self.path), self.schema, compression="zstd")
+        else:
+            self.writer = pa.ipc.new_file(str(self.path), self.schema)
+
+    def flush(self):
+        if not self.rows:
+            return
+        pa = _require_pyarrow()
+        if self.writer is None:
+            self._open()
+        batch = pa.RecordBatch.from_pylist(self.rows, schema=self.schema)
+        if self.fmt == "parquet":
+            self.writer.write_batch(batch)
+        else:
+            self.writer.write(batch)
+        self.written += len(self.rows)
+        self.rows = []
+
+    def close(self):
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def commit(self):
+        self.close()
+        if self.staging_dir.exists():
+            self.final_dir.parent.mkdir(parents=True, exist_ok=True)
+            self.staging_dir.replace(self.final_dir)
+
+    def abort(self):
+        if self.writer is not None:
+            try:
+                self.writer.close()
+            finally:
+                self.writer = None
+        self.rows = []
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+
+class ColumnarExporter:
+    """Stream analysed documents into a clause table and a document table.
+
+    Each exporter instance writes one new partition (`batch=<partition>`), so repeated runs
+    against the same `out_dir` append rather than overwrite. Use as a context manager or call
+    `close()` to publish the partition; leaving the context with an exception (or calling
+    `abort()`) discards it.
+    """
+
+    def __init__(self, out_dir, fmt: str = "parquet", batch_size: int = 10000,
+                 partition: Optional[str] = None):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported format {fmt!r}; expected one of {FORMATS}")
+        self.out_dir = Path(out_dir)
+        self.fmt = fmt
+        self.partition = partition or uuid.uuid4().hex[:12]
+        self.clauses = self._sink("clauses", clause_schema(), batch_size)
+        self.documents = self._sink("documents", document_schema(), batch_size)
+
+    def _sink(self, table: str, schema, batch_size: int) -> _TableSink:
+        part_dir = self.out_dir / table / f"batch={self.partition}"
+        if part_dir.exists():
+            raise FileExistsError(f"Partition already exists: {part_dir}")
+        staging = self.out_dir / table / f"_staging-batch={self.partition}"
+        shutil.rmtree(staging, ignore_errors=True)
+        ext = "parquet" if self.fmt == "parquet" else "feather"
+        return _TableSink(staging, part_dir, f"part-00000.{ext}", schema, self.fmt, batch_size)
+
+    def add_document(self, doc_id: str, text: str) -> Dict[str, object]:
+        doc_row, clause_rows = analyze_document(doc_id, text)
+        self.clauses.add(clause_rows)
+        self.documents.add([doc_row])
+        return doc_row
+
+    def close(self) -> Dict[str, int]:
+        try:
+            self.clauses.commit()
+            self.documents.commit()
+        except BaseException:
+            self.abort()
+            raise
+        return {"documents": self.documents.written, "clauses": self.clauses.written}
+
+    def abort(self):
+        """Discard everything written by this exporter, including already published tables."""
+        for sink in (self.clauses, self.documents):
+            sink.abort()
+            # the partition did not exist when this exporter started, so anything there is ours
+            if sink.final_dir.exists():
+                shutil.rmtree(sink.final_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+def export_corpus(docs: Iterable[Tuple[str, str]], out_dir, fmt: str = "parquet",
+                  batch_size: int = 10000, partition: Optional[str] = None) -> Dict[str, object]:
+    """Export an iterable of (doc_id, text) pairs; the iterable is consumed lazily."""
+    exporter = ColumnarExporter(out_dir, fmt=fmt, batch_size=batch_size, partition=partition)
+    with exporter:
+        for doc_id, text in docs:
+            exporter.add_document(doc_id, text)
+    return {"documents": exporter.documents.written, "clauses": exporter.clauses.written,
+            "partition": exporter.partition}
+
+
+def iter_files(paths: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """Yield (doc_id, text) for each file path, loading one file at a time."""
+    from core.loader import load_uploaded_file
+    for p in paths:
+        path = Path(p)
+        text, _ = load_uploaded_file(path.read_bytes(), path.name)
+        yield path.name, text
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export clause/document results to Parquet or Feather")
+    parser.add_argument("out_dir")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--format", choices=FORMATS, default="parquet")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--partition", default=None)
+    args = parser.parse_args()
+    stats = export_corpus(iter_files(args.files), args.out_dir, fmt=args.format,
+                          batch_size=args.batch_size, partition=args.partition)
+    print(stats)
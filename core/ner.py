@@ -1,20 +1,30 @@
-import re
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-def extract_entities(text: str) -> Dict[str, List[str]]:
+from core.safe_regex import StageBudget, compile_linear, findall
+
+# All quantifiers are bounded so matching stays linear even without RE2 (see core.safe_regex).
+AMOUNT_PATTERN = r"\bRs\.?\s?[0-9,]{1,32}(?:\.[0-9]{1,2})?\b|\bINR\s?[0-9,.]{1,32}\b|\b[0-9,]{1,32}\s?(?:INR|Rs)\b"
+DATE_PATTERN = r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b\d{4}-\d{2}-\d{2}\b|\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]{0,6}\s{1,8}\d{1,2},?\s{1,8}\d{4}\b"
+PARTY_PATTERN = r"between\s{1,16}([^,\n]{1,200}?)\s{1,16}and\s{1,16}([^,\n]{1,200}?)(?:[.,\n]|$)"
+JURISDICTION_PATTERN = r"\b(governed by|jurisdiction of|subject to the laws of)\s{1,16}([^\n,.]{1,200})"
+
+
+def extract_entities(text: str, budget: Optional[StageBudget] = None) -> Dict[str, List[str]]:
+    """Regex entity extraction. Unlimited unless a `budget` is given for the "entities" stage."""
     ents = {"PARTIES": [], "DATES": [], "AMOUNTS": [], "JURISDICTION": []}
+    clock = budget.stage("entities") if budget is not None else None
     # Simple regex-based entity extraction as fallback
     # Amounts
-    for m in re.findall(r"\bRs\.?\s?[0-9,]+(?:\.[0-9]{1,2})?\b|\bINR\s?[0-9,.,]+\b|\b[0-9,]+\s?(?:INR|Rs)\b", text, flags=re.I):
+    for m in findall(compile_linear(AMOUNT_PATTERN, ignore_case=True), text, clock):
         ents["AMOUNTS"].append(m)
     # Dates (simple)
-    for m in re.findall(r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b\d{4}-\d{2}-\d{2}\b|\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4}\b", text, flags=re.I):
+    for m in findall(compile_linear(DATE_PATTERN, ignore_case=True), text, clock):
         ents["DATES"].append(m)
     # Parties: look for 'between X and Y' patterns
-    for m in re.findall(r"between\s+([^,\n]+?)\s+and\s+([^,\n]+?)(?:[.,\n]|$)", text, flags=re.I):
+    for m in findall(compile_linear(PARTY_PATTERN, ignore_case=True), text, clock):
         ents["PARTIES"].extend([m[0].strip(), m[1].strip()])
     # Jurisdiction keywords
-    for m in re.findall(r"\b(governed by|jurisdiction of|subject to the laws of)\s+([^\n,.]+)", text, flags=re.I):
+    for m in findall(compile_linear(JURISDICTION_PATTERN, ignore_case=True), text, clock):
         ents["JURISDICTION"].append(m[1].strip())
     # deduplicate
     for k in ents:
@@ -1,65 +1,49 @@
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 
-OBLIGATION_PATTERNS = [
-	r"\bshall\b",
-	r"\bmust\b",
-	r"\bwill\b",
-	r"\bis required to\b",
-	r"\bagrees to\b",
-	r"\bundertakes to\b",
-	r"\bis obliged to\b",
-]
+from core.rule_pack import RulePack, active_pack
 
-PROHIBITION_PATTERNS = [
-	r"\bshall not\b",
-	r"\bmust not\b",
-	r"\bprohibit(?:ed|s)?\b",
-	r"\bforbidden\b",
-	r"\bmay not\b",
-]
+# Patterns per label come from the rule pack ("obligations" in rules/default.json); labels are
+# tried in the order listed there.
 
-RIGHT_PATTERNS = [
-	r"\bis entitled to\b",
-	r"\bhas the right to\b",
-	r"\bmay exercise\b",
-]
-
-def _matches_any(text: str, patterns: List[str]) -> List[str]:
+def _matches_any(text: str, patterns: List[Tuple[str, object]]) -> List[str]:
 	hits = []
-	for p in patterns:
-		if re.search(p, text, flags=re.I):
+	for p, compiled in patterns:
+		if compiled.search(text):
 			hits.append(p)
 	return hits
 
-def detect_obligations(text: str) -> List[Dict[str, str]]:
+def label_obligation(text: str, rules: Optional[RulePack] = None) -> Tuple[str, List[str]]:
+	"""Label a single passage as Obligation/Right/Prohibition/Neutral.
+
+	Prohibitions take precedence over obligations ("shall not" also contains "shall").
+	Returns a tuple of (label, matched patterns).
+	"""
+	rules = rules or active_pack()
+	for label, patterns in rules.obligation_rules:
+		hits = _matches_any(text, patterns)
+		if hits:
+			return label, hits
+	return "Neutral", []
+
+def detect_obligations(text: str, rules: Optional[RulePack] = None) -> List[Dict[str, str]]:
 	"""Split text into candidate clauses and label each as Obligation/Right/Prohibition/Neutral.
 
 	Returns a list of dicts: {"clause": str, "label": str, "matches": List[str]}
 	"""
 	# naive splitting: by line breaks or sentence endings
 	parts = [p.strip() for p in re.split(r"(?<=[\n\.\;\:])\s+", text) if p.strip()]
+	rules = rules or active_pack()
 	results: List[Dict[str, str]] = []
 	for p in parts:
-		prov = _matches_any(p, PROHIBITION_PATTERNS)
-		if prov:
-			results.append({"clause": p, "label": "Prohibition", "matches": prov})
-			continue
-		oblig = _matches_any(p, OBLIGATION_PATTERNS)
-		if oblig:
-			results.append({"clause": p, "label": "Obligation", "matches": oblig})
-			continue
-		right = _matches_any(p, RIGHT_PATTERNS)
-		if right:
-			results.append({"clause": p, "label": "Right", "matches": right})
-			continue
-		results.append({"clause": p, "label": "Neutral", "matches": []})
+		label, matches = label_obligation(p, rules)
+		results.append({"clause": p, "label": label, "matches": matches})
 	return results
 
-def summarize_obligations(text: str) -> Dict[str, List[str]]:
+def summarize_obligations(text: str, rules: Optional[RulePack] = None) -> Dict[str, List[str]]:
 	data = {"Obligation": [], "Prohibition": [], "Right": [], "Neutral": []}
-	for item in detect_obligations(text):
-		data[item["label"]].append(item["clause"])
+	for item in detect_obligations(text, rules):
+		data.setdefault(item["label"], []).append(item["clause"])
 	return data
 
 if __name__ == "__main__":
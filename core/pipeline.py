@@ -0,0 +1,82 @@
+"""The full contract analysis shared by the Streamlit app and the load tester.
+
+`analyze_contract` runs every stage app.py displays, with a single rule pack and a per-stage
+time budget, so anything that exercises it (e.g. load_test.py) measures what the app does.
+"""
+from typing import Dict, Optional
+
+from core.classifier import classify_contract
+from core.clause_extractor import split_into_clauses
+from core.ner import extract_entities
+from core.obligation_detector import summarize_obligations
+from core.risk_engine import score_clause, contract_score
+from core.rule_pack import RulePack, active_pack
+from core.safe_regex import StageBudget
+from core.summary import summarize_contract, explain_clause, suggest_alternative
+from core.template_index import load_library
+
+MAX_SCORED_CLAUSES = 200
+MAX_EXPLAINED_CLAUSES = 20
+
+
+def analyze_contract(text: str, rules: Optional[RulePack] = None, budget: Optional[StageBudget] = None,
+                     library=None, explain: bool = True) -> Dict[str, object]:
+    """Analyse one contract and return everything the app renders.
+
+    `rules` defaults to the active rule pack, fetched once so the whole analysis uses one
+    version. `library` defaults to the built template index (None if none has been built).
+    Only the first `MAX_SCORED_CLAUSES` clauses are scored; `clause_reasons[i]` holds the
+    `score_clause` details for `clauses_with_scores[i]`. With `explain=False` the per-clause
+    explanations and suggestions are skipped (and no library is loaded), e.g. for batch export.
+    """
+    # one rule pack for the whole analysis, even if a new version is published mid-run
+    rules = rules or active_pack()
+    budget = budget or StageBudget()
+    if library is None and explain:
+        library = load_library()
+
+    ctype, ccounts = classify_contract(text, rules)
+    summary = summarize_contract(text, max_sentences=6, rules=rules)
+
+    clauses = split_into_clauses(text, budget)
+    clauses_with_scores = []
+    clause_reasons = []
+    clause_scores = {}
+    for i, cl in enumerate(clauses[:MAX_SCORED_CLAUSES]):
+        score, reasons = score_clause(cl, rules)
+        clause_scores[i] = score
+        clauses_with_scores.append((cl, score))
+        clause_reasons.append(reasons)
+
+    risk_counts = {level: 0 for level, _ in rules.risk_levels}
+    risk_counts.setdefault(rules.base_risk_label, 0)
+    for _, score in clauses_with_scores:
+        risk_counts[score] = risk_counts.get(score, 0) + 1
+
+    entities = extract_entities(text, budget)
+    obligations = summarize_obligations(text, rules)
+    ob_counts = {k: len(v) for k, v in obligations.items()}
+
+    explained = []
+    for cl, score in (clauses_with_scores[:MAX_EXPLAINED_CLAUSES] if explain else []):
+        suggestion = suggest_alternative(cl, library, rules=rules) if library is not None else None
+        explained.append({"clause": cl, "score": score, "explanation": explain_clause(cl, rules),
+                          "suggestion": suggestion})
+
+    return {
+        "contract_type": ctype,
+        "type_counts": ccounts,
+        "summary": summary,
+        "num_clauses": len(clauses),
+        "clauses": clauses,
+        "clauses_with_scores": clauses_with_scores,
+        "clause_reasons": clause_reasons,
+        "risk_counts": risk_counts,
+        "entities": entities,
+        "obligations": obligations,
+        "obligation_counts": ob_counts,
+        "explained": explained,
+        "composite_score": contract_score(clause_scores),
+        "degraded_stages": sorted(budget.degraded),
+        "rule_pack": rules.version,
+    }
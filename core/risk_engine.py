@@ -1,50 +1,38 @@
-from typing import Tuple, Dict
-import re
+from typing import Tuple, Dict, Optional
 
-# More comprehensive, weighted keyword lists. Each level has keywords with an associated weight.
-RISK_PATTERNS = {
-    "High": [
-        (r"indemnif", 3), (r"liabilit", 3), (r"penalt", 3), (r"forfeit", 3), (r"breach", 3),
-        (r"unilateral termination", 4), (r"irrevoc", 3), (r"assign", 2), (r"security", 2),
-        (r"default", 3), (r"guarantee", 2), (r"personal guarant", 3)
-    ],
-    "Medium": [
-        (r"auto-?renew", 2), (r"lock-?in", 2), (r"non-?compete", 2), (r"confidential", 2),
-        (r"arbitration", 2), (r"jurisdiction", 2), (r"late fee", 2), (r"pre-?payment", 2)
-    ],
-    "Low": [
-        (r"notice period", 1), (r"renewal", 1), (r"payment", 1), (r"deliverable", 1),
-        (r"performance", 1), (r"interest", 1), (r"repay", 1)
-    ]
-}
+from core.rule_pack import RulePack, active_pack
 
+# Weighted patterns per level, the severity cap and label thresholds come from the rule pack
+# ("risk" in rules/default.json).
 
-def score_clause(clause: str) -> Tuple[str, Dict[str, int]]:
+
+def score_clause(clause: str, rules: Optional[RulePack] = None) -> Tuple[str, Dict[str, int]]:
     """Score a clause using weighted regex matching.
 
     Returns a tuple of (label, reasons) where reasons contains counts per level and a numeric
-    `severity` between 0.0 and 1.0.
+    `severity` between 0.0 and 1.0. Uses the active rule pack unless `rules` is given.
     """
+    rules = rules or active_pack()
     text = clause.lower()
-    reasons = {"High": 0, "Medium": 0, "Low": 0, "severity": 0.0}
+    reasons = {level: 0 for level, _ in rules.risk_levels}
+    reasons["severity"] = 0.0
     total_weight = 0.0
-    for level, pats in RISK_PATTERNS.items():
+    for level, pats in rules.risk_levels:
         for pat, w in pats:
-            if re.search(pat, text, flags=re.I):
+            if pat.search(text):
                 reasons[level] += 1
                 total_weight += w
 
     # Normalize severity: map total_weight into [0,1]. Use a soft cap so larger weights saturate.
-    # Heuristic: treat 6+ weight as high severity
-    severity = min(1.0, total_weight / 6.0)
+    # Heuristic: treat saturation_weight (6 in the default pack) as high severity
+    severity = min(1.0, total_weight / rules.saturation_weight)
     reasons["severity"] = round(severity, 3)
 
-    if severity >= 0.6:
-        label = "High"
-    elif severity >= 0.25:
-        label = "Medium"
-    else:
-        label = "Low"
+    label = rules.base_risk_label
+    for level, threshold in rules.risk_thresholds:
+        if severity >= threshold:
+            label = level
+            break
 
     return label, reasons
 
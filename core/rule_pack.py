@@ -0,0 +1,295 @@
+"""Declarative rule packs compiled into versioned, content-addressed artifacts.
+
+Rule tables (risk patterns and weights, obligation patterns, contract-type keywords, summary
+keywords, clause explanations and suggested alternatives) live in a JSON or YAML source such as
+`rules/default.json`. `compile_pack` validates a source, test-compiles every pattern and writes
+a normalised binary artifact:
+
+    header   magic b"CRPK", format version, sha256 of the payload, payload length
+    payload  canonical JSON of the normalised rules
+
+Artifacts are named `<name>-<hash12>.crpk` under `rules/build/`; `rules/build/CURRENT` names the
+one in use. Publishing a new artifact writes it and then replaces CURRENT atomically.
+
+Each process memory-maps the artifact, verifies the hash and compiles the matchers once
+(RE2 where available, see core.safe_regex); under a pre-forking server the loaded pack is shared
+copy-on-write. `active_pack()` re-checks CURRENT at most every `RELOAD_INTERVAL` seconds and
+swaps in the new pack by a single reference assignment. An analysis should call `active_pack()`
+once and pass the pack to every stage, so in-flight work finishes on the version it started with.
+Without a built artifact, the source in `rules/default.json` is compiled in memory.
+
+    python -m core.rule_pack build [rules/default.json]
+    python -m core.rule_pack show
+"""
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.safe_regex import compile_linear
+
+RULES_DIR = Path(__file__).resolve().parent.parent / "rules"
+DEFAULT_SOURCE = RULES_DIR / "default.json"
+BUILD_DIR = RULES_DIR / "build"
+CURRENT_NAME = "CURRENT"
+
+MAGIC = b"CRPK"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct(">4sH32sI")
+RELOAD_INTERVAL = 2.0
+
+
+def load_source(path) -> dict:
+    """Read a rule-pack source file (.json, or .yaml/.yml when PyYAML is installed)."""
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except Exception:
+            raise ImportError("PyYAML is required to read YAML rule packs. Install from requirements.txt")
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+def _check_pattern(where: str, pattern: str):
+    try:
+        re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"{where}: invalid pattern {pattern!r}: {e}")
+
+
+def _conditions(where: str, rules: list) -> list:
+    out = []
+    for i, r in enumerate(rules):
+        all_terms = [t.lower() for t in r.get("all", [])]
+        any_terms = [t.lower() for t in r.get("any", [])]
+        if not all_terms and not any_terms:
+            raise ValueError(f"{where}[{i}]: needs 'all' and/or 'any' terms")
+        if not isinstance(r.get("text"), str):
+            raise ValueError(f"{where}[{i}]: missing 'text'")
+        out.append([all_terms, any_terms, r["text"]])
+    return out
+
+
+def normalize(source: dict) -> dict:
+    """Validate a rule-pack source and convert it to the canonical, order-preserving form.
+
+    Ordered tables (risk levels, obligation precedence, contract types) become lists so the
+    payload can be serialised with sorted keys without losing their order.
+    """
+    try:
+        risk = source["risk"]
+        levels = []
+        for level, pats in risk["levels"].items():
+            for pat, w in pats.items():
+                _check_pattern(f"risk.levels.{level}", pat)
+            levels.append([level, [[pat, float(w)] for pat, w in pats.items()]])
+        thresholds = sorted(([k, float(v)] for k, v in risk["thresholds"].items()), key=lambda x: -x[1])
+
+        obligations = []
+        for label, pats in source["obligations"].items():
+            for pat in pats:
+                _check_pattern(f"obligations.{label}", pat)
+            obligations.append([label, list(pats)])
+
+        return {
+            "name": str(source["name"]),
+            "version": str(source["version"]),
+            "risk": {
+                "levels": levels,
+                "saturation_weight": float(risk["saturation_weight"]),
+                "thresholds": thresholds,
+                "base_label": str(risk["base_label"]),
+            },
+            "obligations": obligations,
+            "contract_types": [[label, [kw.lower() for kw in kws]] for label, kws in source["contract_types"].items()],
+            "summary_keywords": [kw.lower() for kw in source["summary_keywords"]],
+            "explanations": {
+                "rules": _conditions("explanations.rules", source["explanations"]["rules"]),
+                "default": source["explanations"]["default"],
+            },
+            "alternatives": {
+                "rules": _conditions("alternatives.rules", source["alternatives"]["rules"]),
+                "default": source["alternatives"]["default"],
+            },
+        }
+    except KeyError as e:
+        raise ValueError(f"Rule pack is missing required key {e}")
+
+
+def compile_pack(source: dict) -> bytes:
+    """Return the binary artifact for a rule-pack source."""
+    payload = json.dumps(normalize(source), sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    digest = hashlib.sha256(payload).digest()
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, digest, len(payload)) + payload
+
+
+class RulePack:
+    """Compiled, immutable rule tables for one artifact version."""
+
+    def __init__(self, rules: dict, content_hash: str):
+        self.rules = rules
+        self.name = rules["name"]
+        self.pack_version = rules["version"]
+        self.content_hash = content_hash
+        # stamped on analysis results; changes whenever any rule changes
+        self.version = f"{self.name}@{self.pack_version}+{content_hash[:12]}"
+
+        risk = rules["risk"]
+        self.risk_levels: List[Tuple[str, List[Tuple[object, float]]]] = [
+            (level, [(compile_linear(p, ignore_case=True), w) for p, w in pats]) for level, pats in risk["levels"]
+        ]
+        self.saturation_weight = risk["saturation_weight"]
+        self.risk_thresholds: List[Tuple[str, float]] = [tuple(t) for t in risk["thresholds"]]
+        self.base_risk_label = risk["base_label"]
+
+        self.obligation_rules: List[Tuple[str, List[Tuple[str, object]]]] = [
+            (label, [(p, compile_linear(p, ignore_case=True)) for p in pats]) for label, pats in rules["obligations"]
+        ]
+        self.contract_types: List[Tuple[str, List[Tuple[str, object]]]] = [
+            (label, [(kw, compile_linear(r"\b" + re.escape(kw) + r"\b")) for kw in kws])
+            for label, kws in rules["contract_types"]
+        ]
+        self.summary_keywords: List[str] = rules["summary_keywords"]
+        self.explanations = rules["explanations"]
+        self.alternatives = rules["alternatives"]
+
+    @staticmethod
+    def _first_match(table: dict, low: str) -> str:
+        for all_terms, any_terms, text in table["rules"]:
+            if all(t in low for t in all_terms) and (not any_terms or any(t in low for t in any_terms)):
+                return text
+        return table["default"]
+
+    def explanation(self, clause: str) -> str:
+        return self._first_match(self.explanations, clause.lower())
+
+    def alternative(self, clause: str) -> str:
+        return self._first_match(self.alternatives, clause.lower())
+
+
+def parse_artifact(data) -> RulePack:
+    """Verify and load an artifact from bytes or a buffer (e.g. an mmap)."""
+    if len(data) < _HEADER.size:
+        raise ValueError("Rule-pack artifact is truncated")
+    magic, fmt, digest, length = _HEADER.unpack(data[:_HEADER.size])
+    if magic != MAGIC:
+        raise ValueError("Not a rule-pack artifact")
+    if fmt != FORMAT_VERSION:
+        raise ValueError(f"Unsupported rule-pack format {fmt}; expected {FORMAT_VERSION}")
+    payload = data[_HEADER.size:_HEADER.size + length]
+    if len(payload) != length or hashlib.sha256(payload).digest() != digest:
+        raise ValueError("Rule-pack artifact failed its content hash check")
+    return RulePack(json.loads(bytes(payload).decode("utf-8")), digest.hex())
+
+
+def read_artifact(path) -> RulePack:
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return parse_artifact(mm)
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def build(source_path=DEFAULT_SOURCE, build_dir=BUILD_DIR, activate: bool = True) -> Path:
+    """Compile `source_path` into `build_dir` and (by default) make it the current artifact."""
+    build_dir = Path(build_dir)
+    build_dir.mkdir(parents=True, exist_ok=True)
+    artifact = compile_pack(load_source(source_path))
+    pack = parse_artifact(artifact)
+    path = build_dir / f"{pack.name}-{pack.content_hash[:12]}.crpk"
+    if not path.exists():
+        _write_atomic(path, artifact)
+    if activate:
+        _write_atomic(build_dir / CURRENT_NAME, (path.name + "\n").encode("utf-8"))
+    return path
+
+
+class _Slot:
+    """The loaded pack for one (build_dir, source_path) pair and when to look for a newer one."""
+
+    def __init__(self):
+        self.pack: Optional[RulePack] = None
+        self.target: Optional[tuple] = None
+        self.next_check = 0.0
+
+
+_lock = threading.Lock()
+_slots: Dict[Tuple[str, str], _Slot] = {}
+
+
+def _current_target(build_dir: Path, source_path: Path) -> tuple:
+    try:
+        name = (build_dir / CURRENT_NAME).read_text(encoding="utf-8").strip()
+    except OSError:
+        name = ""
+    if name:
+        return ("artifact", str(build_dir / name))
+    try:
+        return ("source", str(source_path), source_path.stat().st_mtime_ns)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"No rule pack found: {build_dir / CURRENT_NAME} names no artifact and "
+                                f"the source {source_path} does not exist (see `python -m core.rule_pack build`)")
+
+
+def active_pack(build_dir=BUILD_DIR, source_path=DEFAULT_SOURCE) -> RulePack:
+    """Return the current rule pack, hot-swapping to a newly published artifact when one appears.
+
+    Packs are tracked separately for each (build_dir, source_path). A newly published artifact
+    that fails to load is ignored and the previous pack stays active.
+    """
+    now = time.monotonic()
+    key = (str(build_dir), str(source_path))
+    slot = _slots.get(key)
+    if slot is not None and slot.pack is not None and now < slot.next_check:
+        return slot.pack
+    with _lock:
+        slot = _slots.setdefault(key, _Slot())
+        if slot.pack is not None and now < slot.next_check:
+            return slot.pack
+        try:
+            target = _current_target(Path(build_dir), Path(source_path))
+            if slot.pack is None or target != slot.target:
+                if target[0] == "artifact":
+                    new = read_artifact(target[1])
+                else:
+                    new = parse_artifact(compile_pack(load_source(target[1])))
+                slot.pack, slot.target = new, target
+        except Exception:
+            if slot.pack is None:
+                raise
+        slot.next_check = now + RELOAD_INTERVAL
+        return slot.pack
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile and inspect rule-pack artifacts")
+    parser.add_argument("--build-dir", default=str(BUILD_DIR))
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    build_p = sub.add_parser("build", help="compile a rule-pack source and make it current")
+    build_p.add_argument("source", nargs="?", default=str(DEFAULT_SOURCE))
+    build_p.add_argument("--no-activate", action="store_true")
+    sub.add_parser("show", help="print the active rule-pack version")
+    args = parser.parse_args()
+
+    if args.cmd == "build":
+        path = build(args.source, args.build_dir, activate=not args.no_activate)
+        print(f"{read_artifact(path).version} -> {path}")
+    else:
+        print(active_pack(args.build_dir).version)
@@ -0,0 +1,133 @@
+"""Linear-time regex matching and per-stage time budgets for hostile or malformed input.
+
+Patterns are compiled with RE2 (`google-re2`) when it is installed and the pattern has no
+lookaround, which guarantees matching time linear in the input. Otherwise Python's `re` is used;
+patterns passed here are expected to be written with bounded quantifiers so that each match
+attempt does a constant amount of backtracking.
+
+Text is matched in windows of about `MAX_BLOCK_CHARS`, cut at a line break where possible, and a
+`StageBudget` is checked between windows: a stage that runs out of CPU time stops early, returns
+what it found so far and is recorded as degraded instead of pinning a CPU. Budgets count the
+calling thread's own CPU time, so waiting on the GIL or the scheduler under load does not use
+them up and the same input gives the same result whatever else the server is doing. Consecutive windows
+overlap by `MAX_MATCH_CHARS`, the longest match any pattern used with `findall` can produce, so
+matches near a cut are found whole and exactly once.
+"""
+import re
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+try:
+    import re2 as _re2
+except Exception:
+    _re2 = None
+
+MAX_BLOCK_CHARS = 64000
+# upper bound on the length of a single match; every pattern passed to findall must respect it
+MAX_MATCH_CHARS = 512
+# CPU seconds per stage; a 300 KB contract needs under 0.1s per stage even on the `re` fallback
+DEFAULT_STAGE_SECONDS = 2.0
+
+# RE2 has no lookaround or backreferences
+_RE2_UNSUPPORTED = re.compile(r"\(\?<?[=!]|\\[1-9]")
+
+_compiled: Dict[tuple, object] = {}
+
+
+def compile_linear(pattern: str, ignore_case: bool = False):
+    """Compile `pattern` with RE2 when possible, falling back to `re`. Results are cached."""
+    key = (pattern, ignore_case)
+    if key in _compiled:
+        return _compiled[key]
+    compiled = None
+    if _re2 is not None and not _RE2_UNSUPPORTED.search(pattern):
+        try:
+            compiled = _re2.compile(("(?i)" if ignore_case else "") + pattern)
+        except Exception:
+            compiled = None
+    if compiled is None:
+        compiled = re.compile(pattern, re.I if ignore_case else 0)
+    _compiled[key] = compiled
+    return compiled
+
+
+def engine_name(compiled) -> str:
+    return "re" if isinstance(compiled, re.Pattern) else "re2"
+
+
+class StageBudget:
+    """CPU-time budget applied separately to each named analysis stage.
+
+    `degraded` maps stage name to a short reason for every stage that was cut short.
+    """
+
+    def __init__(self, seconds: float = DEFAULT_STAGE_SECONDS):
+        self.seconds = seconds
+        self.degraded: Dict[str, str] = {}
+
+    def stage(self, name: str) -> "StageClock":
+        return StageClock(self, name)
+
+
+class StageClock:
+    """Deadline on the CPU time of the thread that starts the stage; check it from that thread."""
+
+    def __init__(self, budget: StageBudget, name: str):
+        self.budget = budget
+        self.name = name
+        self.deadline = time.thread_time() + budget.seconds
+
+    def expired(self) -> bool:
+        if time.thread_time() <= self.deadline:
+            return False
+        self.budget.degraded[self.name] = f"CPU budget of {self.budget.seconds}s exceeded"
+        return True
+
+
+def finditer(compiled, text: str, clock: Optional[StageClock] = None,
+             max_block: int = MAX_BLOCK_CHARS, max_match: int = MAX_MATCH_CHARS) -> Iterator[Tuple[Tuple[int, int], object]]:
+    """Yield `((start, end), match)` for each match of `compiled` in `text`, window by window.
+
+    Stops once `clock` expires. `start`/`end` are offsets into `text`; the match object's own
+    positions are relative to the window. A match ending within `max_match` characters of a
+    window's cut may have been truncated by it, so it is dropped and the next window starts at
+    that match; for patterns whose matches are at most `max_match` long the result is the same
+    as an unwindowed scan.
+    """
+    n = len(text)
+    pos = 0
+    while pos < n:
+        if clock is not None and clock.expired():
+            return
+        endpos = n
+        if pos + max_block < n:
+            endpos = pos + max_block
+            # prefer cutting after a line break, keeping the window longer than two overlaps
+            nl = text.rfind("\n", pos + 2 * max_match + 1, endpos)
+            if nl != -1:
+                endpos = nl + 1
+        # match on a slice (RE2 converts offsets from the start of whatever string it is given),
+        # keeping one character before the window so \b sees what precedes it
+        base = max(0, pos - 1)
+        window = text[base:endpos]
+        next_pos = max(pos, endpos - max_match)
+        for m in compiled.finditer(window, pos - base):
+            start, end = base + m.start(), base + m.end()
+            if endpos < n and end > endpos - max_match:
+                next_pos = start
+                break
+            yield (start, end), m
+            next_pos = max(next_pos, end)
+        if endpos == n:
+            return
+        # only a match longer than max_match can stall here; move on rather than loop
+        pos = next_pos if next_pos > pos else endpos
+
+
+def findall(compiled, text: str, clock: Optional[StageClock] = None) -> list:
+    """`compiled.findall(text)` computed window by window (see `finditer`)."""
+    groups = compiled.groups
+    out = []
+    for _, m in finditer(compiled, text, clock):
+        out.append(m.group(0) if groups == 0 else m.group(1) if groups == 1 else m.groups())
+    return out
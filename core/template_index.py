@@ -0,0 +1,278 @@
+"""MinHash/LSH index of approved clause wording for near-duplicate matching.
+
+Clauses from `templates/` (and any precedent contracts added later) are shingled into word
+3-grams, summarised as MinHash signatures and bucketed by LSH bands, so finding the nearest
+approved clause only compares against the few candidates that share a band instead of the
+whole library.
+
+On disk an index is a directory:
+
+    meta.json               parameters (num_perm, bands, seed, shingle size)
+    clauses.jsonl           one {"text", "source"} record per indexed clause
+    signatures-NNNNN.npy    signature chunks, one per `save()` call
+
+`save()` only writes what was added since the last save, so the index grows incrementally. New
+files are written under a temporary name and renamed into place; a reader that catches the
+index mid-save (chunk published, clauses not yet appended) gets a `ValueError` from `load()`.
+`load_library()` caches the loaded index per process and reloads it only when those files change.
+"""
+import json
+import os
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.clause_extractor import split_into_clauses
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+INDEX_DIR = TEMPLATES_DIR / "index"
+TEMPLATE_SUFFIXES = (".txt", ".pdf", ".docx", ".doc")
+
+NUM_PERM = 144
+BANDS = 48  # 3 rows per band: candidates from roughly 0.28 Jaccard similarity upwards
+SHINGLE_SIZE = 3
+_PRIME = 4294967311  # smallest prime above 2**32
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> set:
+    """Word k-grams of the normalised text (single words for clauses shorter than k)."""
+    tokens = _TOKEN.findall(text.lower())
+    if len(tokens) < k:
+        return set(tokens)
+    return {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+
+def _write_atomic(path: Path, write):
+    """Write a file via `write(binary_file)` under a temporary name, then rename it into place."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+class TemplateLibrary:
+    """Persisted, incrementally updatable MinHash/LSH index of approved clauses."""
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS, seed: int = 1,
+                 shingle_size: int = SHINGLE_SIZE):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.seed = seed
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        # a < 2**31 and hashes < 2**32 keep a*x + b inside uint64
+        self._a = rng.randint(1, 2 ** 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self.records: List[Dict[str, str]] = []
+        self._matrix = np.zeros((0, num_perm), dtype=np.uint32)
+        self._tail: List[np.ndarray] = []
+        self._unsaved = 0
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self._seen: set = set()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        sh = shingles(text, self.shingle_size)
+        if not sh:
+            return None
+        hv = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in sh), dtype=np.uint64, count=len(sh))
+        perm = (np.outer(self._a, hv) + self._b[:, None]) % np.uint64(_PRIME)
+        return perm.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, sig: np.ndarray) -> List[bytes]:
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, text: str, source: str = "") -> bool:
+        """Index one clause; returns False for empty or already-indexed wording."""
+        norm = " ".join(_TOKEN.findall(text.lower()))
+        if not norm or norm in self._seen:
+            return False
+        sig = self.signature(text)
+        if sig is None:
+            return False
+        idx = len(self.records)
+        for band, key in enumerate(self._band_keys(sig)):
+            self._buckets[band].setdefault(key, []).append(idx)
+        self.records.append({"text": text.strip(), "source": source})
+        self._tail.append(sig)
+        self._unsaved += 1
+        self._seen.add(norm)
+        return True
+
+    def add_document(self, text: str, source: str = "") -> int:
+        """Split a contract into clauses and index each; returns the number added."""
+        # split_into_clauses looks for blank lines, which CRLF files would hide
+        text = text.replace("\r\n", "\n")
+        return sum(1 for cl in split_into_clauses(text) if self.add(cl, source))
+
+    def add_files(self, paths: Iterable[Path]) -> int:
+        from core.loader import load_uploaded_file
+        added = 0
+        for p in paths:
+            p = Path(p)
+            text, _ = load_uploaded_file(p.read_bytes(), p.name)
+            added += self.add_document(text, p.name)
+        return added
+
+    def _signatures(self) -> np.ndarray:
+        if self._tail:
+            self._matrix = np.vstack([self._matrix] + self._tail)
+            self._tail = []
+        return self._matrix
+
+    def nearest(self, clause: str, min_similarity: float = 0.0) -> Optional[Tuple[Dict[str, str], float]]:
+        """Return (record, estimated Jaccard similarity) of the closest indexed clause, or None."""
+        sig = self.signature(clause)
+        if sig is None:
+            return None
+        candidates = set()
+        for band, key in enumerate(self._band_keys(sig)):
+            candidates.update(self._buckets[band].get(key, ()))
+        if not candidates:
+            return None
+        ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        sims = (self._signatures()[ids] == sig).mean(axis=1)
+        best = int(sims.argmax())
+        score = float(sims[best])
+        if score < min_similarity:
+            return None
+        return self.records[int(ids[best])], round(score, 3)
+
+    # ---------------- persistence ----------------
+
+    def save(self, path=INDEX_DIR):
+        """Write meta.json and append clauses/signatures added since the last save or load."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        meta = {"num_perm": self.num_perm, "bands": self.bands, "seed": self.seed,
+                "shingle_size": self.shingle_size}
+        meta_path = path / "meta.json"
+        if meta_path.exists():
+            if json.loads(meta_path.read_text()) != meta:
+                raise ValueError(f"Index at {path} was built with different parameters")
+        else:
+            _write_atomic(meta_path, lambda f: f.write(json.dumps(meta, indent=2).encode("utf-8")))
+        if not self._unsaved:
+            return
+        start = len(self.records) - self._unsaved
+        n_chunks = len(list(path.glob("signatures-*.npy")))
+        chunk = self._signatures()[start:]
+        _write_atomic(path / f"signatures-{n_chunks:05d}.npy", lambda f: np.save(f, chunk))
+        with open(path / "clauses.jsonl", "a", encoding="utf-8") as f:
+            for rec in self.records[start:]:
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._unsaved = 0
+
+    @classmethod
+    def load(cls, path=INDEX_DIR) -> "TemplateLibrary":
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        lib = cls(**meta)
+        chunks = [np.load(p) for p in sorted(path.glob("signatures-*.npy"))]
+        records = []
+        clauses_path = path / "clauses.jsonl"
+        if clauses_path.exists():
+            with open(clauses_path, encoding="utf-8") as f:
+                records = [json.loads(line) for line in f if line.strip()]
+        sigs = np.vstack(chunks) if chunks else np.zeros((0, lib.num_perm), dtype=np.uint32)
+        if len(sigs) != len(records):
+            raise ValueError(f"Index at {path} is inconsistent: {len(sigs)} signatures, {len(records)} clauses")
+        lib.records = records
+        lib._matrix = sigs.astype(np.uint32)
+        for idx, sig in enumerate(sigs):
+            for band, key in enumerate(lib._band_keys(sig)):
+                lib._buckets[band].setdefault(key, []).append(idx)
+        lib._seen = {" ".join(_TOKEN.findall(r["text"].lower())) for r in records}
+        return lib
+
+
+def template_paths(directory=TEMPLATES_DIR) -> List[Path]:
+    return sorted(p for p in Path(directory).iterdir() if p.is_file() and p.suffix.lower() in TEMPLATE_SUFFIXES)
+
+
+_cache_lock = threading.Lock()
+_cache: Dict[str, Tuple[Optional[tuple], Optional[TemplateLibrary]]] = {}
+
+
+def _index_stamp(path: Path) -> Optional[tuple]:
+    """(name, mtime, size) of every index file, or None if no index has been built at `path`."""
+    stamp = []
+    for p in [path / "meta.json", path / "clauses.jsonl"] + sorted(path.glob("signatures-*.npy")):
+        try:
+            st = p.stat()
+        except OSError:
+            if p.name == "meta.json":
+                return None
+            continue
+        stamp.append((p.name, st.st_mtime_ns, st.st_size))
+    return tuple(stamp)
+
+
+def load_library(path=INDEX_DIR) -> Optional[TemplateLibrary]:
+    """Return the index at `path` if one has been built, else None.
+
+    The library is loaded once per process and reused until the index files change (e.g. a
+    `save()` that adds new precedents), so it can be requested for every analysis. It is shared:
+    to add clauses, load a private copy with `TemplateLibrary.load`.
+    """
+    path = Path(path)
+    key = str(path.resolve())
+    stamp = _index_stamp(path)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        lib = None
+        if stamp is not None:
+            try:
+                lib = TemplateLibrary.load(path)
+            except (ValueError, EOFError, OSError):
+                # most likely caught mid-save; keep serving the previous version and retry next call
+                if cached is not None and cached[1] is not None:
+                    return cached[1]
+                raise
+        _cache[key] = (stamp, lib)
+        return lib
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build, extend or query the approved-clause template index")
+    parser.add_argument("--index", default=str(INDEX_DIR))
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    add_p = sub.add_parser("add", help="index templates/ (default) or the given precedent contracts")
+    add_p.add_argument("files", nargs="*")
+    query_p = sub.add_parser("query", help="find the closest approved clause")
+    query_p.add_argument("clause")
+    args = parser.parse_args()
+
+    if args.cmd == "add":
+        index = Path(args.index)
+        lib = TemplateLibrary.load(index) if (index / "meta.json").exists() else TemplateLibrary()
+        added = lib.add_files(args.files or template_paths())
+        lib.save(args.index)
+        print(f"Added {added} clauses; index now holds {len(lib)}")
+    else:
+        lib = load_library(args.index)
+        match = lib.nearest(args.clause) if lib else None
+        print(json.dumps({"match": match[0], "similarity": match[1]} if match else None, indent=2))
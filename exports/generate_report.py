@@ -1,32 +1,33 @@
 from pathlib import Path
+import base64
+import html as html_lib
 import sys
 # ensure project root is on sys.path so sibling package `core` can be imported when running
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from core.classifier import classify_contract
-from core.summary import summarize_contract, explain_clause, suggest_alternative
-from core.ner import extract_entities
-from core.obligation_detector import summarize_obligations
-from core.clause_extractor import split_into_clauses
-from core.risk_engine import score_clause, contract_score
+from core.summary import suggest_alternative
+from core.pipeline import analyze_contract
+from core.charts import risk_chart, obligation_chart
+from core.rule_pack import active_pack
 
 TEMPLATE = Path("templates") / "business_loan_sample.txt"
 OUT = Path("exports") / "report.html"
 
 text = TEMPLATE.read_text(encoding="utf-8")
 
-ctype, ccounts = classify_contract(text)
-summary = summarize_contract(text, max_sentences=6)
-entities = extract_entities(text)
-obligations = summarize_obligations(text)
-clauses = split_into_clauses(text)
-clauses_with_scores = []
-clause_scores = {}
-for i, cl in enumerate(clauses):
-    score, _ = score_clause(cl)
-    clause_scores[i] = score
-    clauses_with_scores.append((cl, score))
-comp = contract_score(clause_scores)
+rules = active_pack()
+result = analyze_contract(text, rules=rules)
+ctype = result["contract_type"]
+summary = result["summary"]
+entities = result["entities"]
+obligations = result["obligations"]
+comp = result["composite_score"]
+risk_counts = result["risk_counts"]
+ob_counts = result["obligation_counts"]
+
+
+def img_tag(png: bytes, alt: str) -> str:
+    return f"<img alt='{alt}' src='data:image/png;base64,{base64.b64encode(png).decode('ascii')}'>"
 
 html = []
 html.append(f"<html><head><meta charset='utf-8'><title>Contract Report</title></head><body style='font-family:Arial,sans-serif'>")
@@ -45,7 +46,10 @@ html.append(f"<li><b>AMOUNTS:</b> {', '.join(entities.get('AMOUNTS',[])) or '—
 html.append(f"<li><b>JURISDICTION:</b> {', '.join(entities.get('JURISDICTION',[])) or '—'}</li>")
 html.append("</ul>")
 
+html.append("<h2>Clause Risk Distribution</h2>")
+html.append(img_tag(risk_chart(risk_counts), "Clause Risk Distribution"))
 html.append("<h2>Obligations / Rights / Prohibitions</h2>")
+html.append(img_tag(obligation_chart(ob_counts), "Obligations Distribution"))
 for label, items in obligations.items():
     html.append(f"<h3>{label} ({len(items)})</h3><ul>")
     for it in items[:10]:
@@ -53,15 +57,17 @@ for label, items in obligations.items():
     html.append("</ul>")
 
 html.append("<h2>Suggested Alternative Clauses (Top Matches)</h2>")
-for i, (cl, score) in enumerate(clauses_with_scores[:20]):
-    sug = suggest_alternative(cl)
-    html.append(f"<p><b>Clause {i+1} suggestion:</b> {sug}</p>")
+for i, item in enumerate(result["explained"]):
+    # suggestions quote clause wording from user-added precedents; escape before embedding
+    sug = item["suggestion"] or suggest_alternative(item["clause"], rules=rules)
+    html.append(f"<p><b>Clause {i+1} suggestion:</b> {html_lib.escape(sug)}</p>")
 
 html.append("<h2>Clause-level Risk & Explanations</h2>")
-for i, (cl, score) in enumerate(clauses_with_scores[:20]):
-    html.append(f"<p><b>Clause {i+1} — {score}</b> — {explain_clause(cl)}</p>")
+for i, item in enumerate(result["explained"]):
+    html.append(f"<p><b>Clause {i+1} — {html_lib.escape(item['score'])}</b> — {html_lib.escape(item['explanation'])}</p>")
 
 html.append(f"<h2>Contract Composite Risk Score</h2><p>{comp} / 100</p>")
+html.append(f"<p><small>Rule pack: {rules.version}</small></p>")
 html.append("</body></html>")
 
 OUT.write_text('\n'.join(html), encoding='utf-8')
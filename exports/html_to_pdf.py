@@ -1,8 +1,11 @@
 from pathlib import Path
+import base64
+import io
 import sys
 import re
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
 
 # ensure project root on path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -17,6 +20,17 @@ if not HTML.exists():
 raw = HTML.read_text(encoding="utf-8")
 # simple convert: replace some tags with newlines/bullets
 s = raw
+# chart images are embedded as PNG data URIs by generate_report.py; keep their bytes and leave a
+# placeholder line so they can be drawn in place
+images = []
+
+
+def _keep_image(m):
+    images.append(base64.b64decode(m.group(1)))
+    return f"\n[[IMG {len(images) - 1}]]\n"
+
+
+s = re.sub(r"<img[^>]*src='data:image/png;base64,([A-Za-z0-9+/=]+)'[^>]*>", _keep_image, s)
 s = s.replace("<li>", "\n- ")
 s = s.replace("</li>", "")
 s = re.sub(r"<h1.*?>", "\n\n", s)
@@ -44,6 +58,21 @@ max_width = width - 2*margin
 max_chars = int(max_width / 5.2)
 
 for para in lines:
+    img = re.fullmatch(r"\[\[IMG (\d+)\]\]", para)
+    if img:
+        reader = ImageReader(io.BytesIO(images[int(img.group(1))]))
+        iw, ih = reader.getSize()
+        draw_w = min(max_width, 360)
+        draw_h = ih * draw_w / iw
+        c.drawText(text_obj)
+        if y - draw_h < margin:
+            c.showPage()
+            y = height - margin
+        c.drawImage(reader, x, y - draw_h, width=draw_w, height=draw_h)
+        y -= draw_h + 12
+        text_obj = c.beginText(x, y)
+        text_obj.setFont("Helvetica", 10)
+        continue
     # wrap paragraph
     while para:
         chunk = para[:max_chars]
@@ -0,0 +1,337 @@
+"""Concurrent load generator for the contract analysis pipeline.
+
+Drives either the `core` pipeline in-process or an HTTP front end (by default a local stand-in
+server wrapping the same pipeline) with synthetic contracts of mixed sizes, then reports
+throughput, latency percentiles, error rate and process memory over time as JSON. The rule-pack
+versions that served the run and the number of results with degraded stages are recorded too,
+so runs are only compared like for like.
+
+Memory is sampled in this process. In-process runs and the stand-in server therefore report the
+analysing worker's memory; with `--url` the figures only cover the load-generating client and are
+labelled `"scope": "client"`.
+
+Example:
+
+    python load_test.py --target inprocess --concurrency 50 --requests 500 --out load.json
+    python load_test.py --target http --rate 20 --duration 30 --charts
+"""
+import argparse
+import json
+import math
+import os
+import random
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.charts import risk_chart, obligation_chart
+from core.pipeline import analyze_contract
+
+CLAUSE_SNIPPETS = [
+    "The Borrower shall repay the loan of INR 25,00,000 in equal monthly instalments with interest at 14% per annum.",
+    "The Supplier shall indemnify the Purchaser against any and all losses arising from breach of this Agreement.",
+    "This Agreement will automatically renew unless either party gives 30 days' prior written notice.",
+    "The Employee shall serve a probation of 6 months and is subject to a notice period of 1 month for termination.",
+    "The Contractor must not assign this Agreement without prior written consent of the Client.",
+    "All disputes shall be finally settled by arbitration in Mumbai and subject to the laws of India.",
+    "The Tenant is entitled to quiet enjoyment of the premises and the Landlord may not enter without notice.",
+    "Each party shall keep confidential all information received under this Agreement for 3 years.",
+    "A late fee of Rs. 500 shall apply to any payment received after 15/08/2025.",
+    "The Partner shall contribute capital of INR 10,00,000 and the profit share shall be 50%.",
+    "The Vendor shall deliver the goods listed in each purchase order within 30 days of the invoice date.",
+    "Unilateral termination by the Lender shall result in forfeiture of the security deposit.",
+]
+
+# name -> (number of clauses, relative weight)
+DEFAULT_SIZE_MIX = {"small": (8, 0.6), "medium": (60, 0.3), "large": (300, 0.1)}
+
+
+def synthetic_contract(n_clauses: int, rng: random.Random) -> str:
+    """Build a numbered synthetic contract from the snippet pool."""
+    lines = ["This Agreement is made between Alpha Pvt Ltd and Beta LLP.", ""]
+    for i in range(n_clauses):
+        lines.append(f"{i + 1}. {rng.choice(CLAUSE_SNIPPETS)}")
+    return "\n".join(lines)
+
+
+def build_corpus(size_mix: Dict[str, Tuple[int, float]], per_size: int, seed: int) -> Dict[str, List[str]]:
+    rng = random.Random(seed)
+    return {name: [synthetic_contract(n, rng) for _ in range(per_size)] for name, (n, _) in size_mix.items()}
+
+
+def analyze_text(text: str, charts: bool = False) -> Dict[str, object]:
+    """Run the app's analysis (core.pipeline) and, optionally, its chart rendering."""
+    result = analyze_contract(text)
+    if charts:
+        risk_chart(result["risk_counts"])
+        obligation_chart(result["obligation_counts"])
+    # tuples -> lists so the stand-in server can return it as JSON
+    result["clauses_with_scores"] = [list(x) for x in result["clauses_with_scores"]]
+    return result
+
+
+class _AnalyzeHandler(BaseHTTPRequestHandler):
+    charts = False
+
+    def do_POST(self):
+        if self.path != "/analyze":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        text = self.rfile.read(length).decode("utf-8", errors="ignore")
+        try:
+            body = json.dumps(analyze_text(text, charts=self.charts)).encode("utf-8")
+        except Exception as e:
+            self.send_error(500, str(e))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_standin_server(charts: bool = False, port: int = 0) -> ThreadingHTTPServer:
+    """Start a threaded local HTTP server exposing POST /analyze; returns the running server."""
+    handler = type("AnalyzeHandler", (_AnalyzeHandler,), {"charts": charts})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def http_target(url: str, timeout: float = 60.0) -> Callable[[str], object]:
+    def call(text: str):
+        req = urllib.request.Request(url, data=text.encode("utf-8"), method="POST",
+                                     headers={"Content-Type": "text/plain; charset=utf-8"})
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read())
+    return call
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB (peak RSS where /proc is unavailable, 0.0 if neither is)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 2)
+    except Exception:
+        pass
+    try:
+        import resource
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2)
+    except Exception:
+        return 0.0
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of `values` (pct in 0-100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[k]
+
+
+def _memory_sampler(samples: List[Dict[str, float]], t0: float, stop: threading.Event, interval: float):
+    while not stop.is_set():
+        samples.append({"t": round(time.perf_counter() - t0, 3), "rss_mb": rss_mb()})
+        stop.wait(interval)
+
+
+def run_load(call: Callable[[str], object], corpus: Dict[str, List[str]],
+             size_mix: Dict[str, Tuple[int, float]], concurrency: int = 10,
+             requests: Optional[int] = 200, duration: Optional[float] = None,
+             rate: Optional[float] = None, seed: int = 0,
+             mem_interval: float = 0.5, memory_scope: str = "worker") -> Dict[str, object]:
+    """Issue requests against `call` and collect latency/error/memory statistics.
+
+    With `rate` set, arrivals are open-loop (Poisson, `rate` per second) and queue for one of
+    `concurrency` workers; latency then includes queueing delay. Without it, `concurrency`
+    workers issue requests back-to-back. The run stops after `requests` requests or `duration`
+    seconds, whichever comes first. `memory_scope` labels whose memory the RSS samples describe
+    ("worker" when `call` runs the analysis in this process, "client" otherwise). Results that
+    are dicts are tallied by their `rule_pack` and `degraded_stages` entries.
+    """
+    rng = random.Random(seed)
+    names = list(size_mix)
+    weights = [size_mix[n][1] for n in names]
+    lock = threading.Lock()
+    records: List[Tuple[str, float, bool]] = []
+    errors: Dict[str, int] = {}
+    rule_packs: Dict[str, int] = {}
+    degraded_stages: Dict[str, int] = {}
+    degraded = [0]
+
+    def one(size: str, text: str, scheduled: float):
+        ok = True
+        result = None
+        try:
+            result = call(text)
+        except Exception as e:
+            ok = False
+            with lock:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+        latency = time.perf_counter() - scheduled
+        with lock:
+            records.append((size, latency, ok))
+            if isinstance(result, dict):
+                pack = str(result.get("rule_pack"))
+                rule_packs[pack] = rule_packs.get(pack, 0) + 1
+                stages = result.get("degraded_stages") or []
+                if stages:
+                    degraded[0] += 1
+                for stage in stages:
+                    degraded_stages[stage] = degraded_stages.get(stage, 0) + 1
+
+    mem_samples: List[Dict[str, float]] = []
+    stop = threading.Event()
+    t0 = time.perf_counter()
+    sampler = threading.Thread(target=_memory_sampler, args=(mem_samples, t0, stop, mem_interval), daemon=True)
+    sampler.start()
+
+    deadline = t0 + duration if duration else None
+    issued = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        next_at = t0
+        inflight = threading.BoundedSemaphore(concurrency)
+        while (requests is None or issued < requests) and (deadline is None or time.perf_counter() < deadline):
+            size = rng.choices(names, weights)[0]
+            text = rng.choice(corpus[size])
+            if rate:
+                next_at += rng.expovariate(rate)
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(one, size, text, next_at)
+            else:
+                inflight.acquire()
+                fut = pool.submit(one, size, text, time.perf_counter())
+                fut.add_done_callback(lambda _: inflight.release())
+            issued += 1
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    sampler.join()
+    mem_samples.append({"t": round(elapsed, 3), "rss_mb": rss_mb()})
+
+    def stats(lat: List[float]) -> Dict[str, Optional[float]]:
+        return {
+            "count": len(lat),
+            "mean_ms": round(sum(lat) / len(lat) * 1000, 3) if lat else None,
+            "p50_ms": round(percentile(lat, 50) * 1000, 3) if lat else None,
+            "p95_ms": round(percentile(lat, 95) * 1000, 3) if lat else None,
+            "p99_ms": round(percentile(lat, 99) * 1000, 3) if lat else None,
+            "max_ms": round(max(lat) * 1000, 3) if lat else None,
+        }
+
+    ok_lat = [lat for _, lat, ok in records if ok]
+    failed = sum(1 for _, _, ok in records if not ok)
+    start_mb = mem_samples[0]["rss_mb"] if mem_samples else None
+    end_mb = mem_samples[-1]["rss_mb"] if mem_samples else None
+    return {
+        "requests": len(records),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(records) / elapsed, 3) if elapsed else None,
+        "error_rate": round(failed / len(records), 4) if records else 0.0,
+        "errors": errors,
+        "rule_packs": rule_packs,
+        "degraded_results": degraded[0],
+        "degraded_stages": degraded_stages,
+        "latency": stats(ok_lat),
+        "latency_by_size": {n: stats([lat for s, lat, ok in records if ok and s == n]) for n in names},
+        "memory": {
+            "scope": memory_scope,
+            "start_mb": start_mb,
+            "end_mb": end_mb,
+            "growth_mb": round(end_mb - start_mb, 2) if mem_samples else None,
+            "samples": mem_samples,
+        },
+    }
+
+
+def _parse_mix(spec: str) -> Dict[str, Tuple[int, float]]:
+    """Parse a `--mix` value such as "small=8:0.6,large=300:0.4" (name=clauses:weight, ...)."""
+    mix = {}
+    for part in spec.split(","):
+        try:
+            name, val = part.split("=")
+            n, w = val.split(":")
+            name, n, w = name.strip(), int(n), float(w)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid size {part.strip()!r}; expected name=clauses:weight")
+        if not name or n < 1 or not w > 0 or math.isinf(w):
+            raise argparse.ArgumentTypeError(f"invalid size {part.strip()!r}; needs a name, clauses >= 1 and weight > 0")
+        if name in mix:
+            raise argparse.ArgumentTypeError(f"size {name!r} is given more than once")
+        mix[name] = (n, w)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for the contract analysis pipeline")
+    parser.add_argument("--target", choices=["inprocess", "http"], default="inprocess")
+    parser.add_argument("--url", default=None, help="HTTP endpoint; a local stand-in server is started if omitted")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=None, help="seconds; overrides --requests")
+    parser.add_argument("--rate", type=float, default=None, help="open-loop arrivals per second")
+    parser.add_argument("--mix", type=_parse_mix, default=None,
+                        help="size mix, e.g. small=8:0.6,medium=60:0.3,large=300:0.1")
+    parser.add_argument("--per-size", type=int, default=5, help="distinct synthetic contracts per size")
+    parser.add_argument("--charts", action="store_true", help="also render the app's charts per request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="write results JSON to this path")
+    args = parser.parse_args()
+
+    mix = args.mix or dict(DEFAULT_SIZE_MIX)
+    corpus = build_corpus(mix, args.per_size, args.seed)
+    server = None
+    if args.target == "http":
+        url = args.url
+        if url is None:
+            server = start_standin_server(charts=args.charts)
+            url = f"http://127.0.0.1:{server.server_address[1]}/analyze"
+        call = http_target(url)
+    else:
+        url = None
+        call = lambda text: analyze_text(text, charts=args.charts)
+
+    try:
+        result = run_load(call, corpus, mix, concurrency=args.concurrency,
+                          requests=None if args.duration else args.requests,
+                          duration=args.duration, rate=args.rate, seed=args.seed,
+                          memory_scope="client" if args.target == "http" and args.url else "worker")
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    result["config"] = {
+        "target": args.target,
+        "url": url,
+        "concurrency": args.concurrency,
+        "rate": args.rate,
+        "size_mix": {k: {"clauses": n, "weight": w} for k, (n, w) in mix.items()},
+        "charts": args.charts,
+        "seed": args.seed,
+        "timestamp": int(time.time()),
+    }
+    text = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"Results written to {args.out}")
+    summary = {k: result[k] for k in ("requests", "throughput_rps", "error_rate", "rule_packs", "degraded_results",
+                                      "latency")}
+    summary[f"{result['memory']['scope']}_memory_growth_mb"] = result["memory"]["growth_mb"]
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
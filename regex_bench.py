@@ -0,0 +1,152 @@
+"""Adversarial-input benchmark for the regex-driven analysis stages.
+
+Each case in `ADVERSARIAL_CASES` builds hostile input of a given size (long OCR-style lines,
+whitespace runs, repeated trigger words). Each stage is timed `--repeats` times per size and the
+best time kept. The growth exponent is the slope of a least-squares fit of log(time) against
+log(size) over the whole size range: about 1 for linear behaviour, 2 for quadratic. `--check`
+exits non-zero if any stage's slope exceeds `--max-slope`.
+
+    python regex_bench.py --sizes 20000 40000 80000 160000 --check
+    python regex_bench.py --legacy --sizes 1000 2000 4000   # original patterns, for comparison
+"""
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from core.classifier import classify_contract
+from core.clause_extractor import split_into_clauses
+from core.ner import extract_entities
+from core.obligation_detector import detect_obligations
+from core.safe_regex import StageBudget, compile_linear, engine_name
+from core import clause_extractor, ner
+
+
+def _ocr_garbage(n: int) -> str:
+    rng = random.Random(n)
+    return "".join(rng.choice("aeINRs01,. \t-/") for _ in range(n))
+
+
+ADVERSARIAL_CASES: Dict[str, Callable[[int], str]] = {
+    "between_spaces": lambda n: "between" + " " * n + "x",
+    "between_repeated": lambda n: ("between a " * (n // 10 + 1))[:n],
+    "amount_digit_commas": lambda n: ("1," * (n // 2 + 1))[:n],
+    "inr_separators": lambda n: "INR " + ("1,." * (n // 3 + 1))[:n] + "x",
+    "month_spaces": lambda n: "January" + " " * n + "x",
+    "governed_repeated": lambda n: ("governed by " * (n // 12 + 1))[:n],
+    "blank_lines": lambda n: "\n" * n,
+    "whitespace_lines": lambda n: ("\n \t\r" * (n // 4 + 1))[:n] + "x",
+    "ocr_garbage_line": _ocr_garbage,
+}
+
+# Patterns as they were before core.safe_regex, kept only to demonstrate the worst case.
+LEGACY_PATTERNS = {
+    "party": r"between\s+([^,\n]+?)\s+and\s+([^,\n]+?)(?:[.,\n]|$)",
+    "amount": r"\bRs\.?\s?[0-9,]+(?:\.[0-9]{1,2})?\b|\bINR\s?[0-9,.,]+\b|\b[0-9,]+\s?(?:INR|Rs)\b",
+    "clause_split": r"\n\s*(?=(?:\d+\.|\d+\)|Section\s+\d+|Clause\s+\d+))",
+}
+
+
+def _legacy_stages() -> Dict[str, Callable[[str], object]]:
+    return {
+        "party": lambda t: re.findall(LEGACY_PATTERNS["party"], t, flags=re.I),
+        "amount": lambda t: re.findall(LEGACY_PATTERNS["amount"], t, flags=re.I),
+        "clause_split": lambda t: re.split(LEGACY_PATTERNS["clause_split"], t),
+    }
+
+
+def _current_stages(budget_s: float) -> Dict[str, Callable[[str], object]]:
+    return {
+        "entities": lambda t: extract_entities(t, StageBudget(budget_s)),
+        "clauses": lambda t: split_into_clauses(t, StageBudget(budget_s)),
+        "obligations": detect_obligations,
+        "classify": classify_contract,
+    }
+
+
+def _time(fn: Callable[[str], object], text: str, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def growth_slope(sizes: List[int], timings: List[float]) -> Optional[float]:
+    """Least-squares slope of log(time) against log(size); None if there is nothing to fit."""
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, timings) if t > 0]
+    if len(points) < 2:
+        return None
+    mx = sum(x for x, _ in points) / len(points)
+    my = sum(y for _, y in points) / len(points)
+    sxx = sum((x - mx) ** 2 for x, _ in points)
+    if sxx == 0:
+        return None
+    return sum((x - mx) * (y - my) for x, y in points) / sxx
+
+
+def run(sizes: List[int], stages: Dict[str, Callable[[str], object]], repeats: int = 3) -> Dict[str, object]:
+    results = {}
+    for case, gen in ADVERSARIAL_CASES.items():
+        for stage, fn in stages.items():
+            timings = []
+            for n in sizes:
+                timings.append(_time(fn, gen(n), repeats))
+            ratios = [round(b / a, 2) if a > 1e-4 else None for a, b in zip(timings, timings[1:])]
+            slope = growth_slope(sizes, timings)
+            results[f"{case}/{stage}"] = {
+                "seconds": [round(t, 5) for t in timings],
+                "growth_ratios": ratios,
+                "slope": round(slope, 2) if slope is not None else None,
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worst-case timing of regex stages on adversarial input")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20000, 40000, 80000, 160000])
+    parser.add_argument("--legacy", action="store_true", help="time the original (backtracking) patterns")
+    parser.add_argument("--budget", type=float, default=60.0, help="per-stage budget in seconds")
+    parser.add_argument("--repeats", type=int, default=3, help="timings per size; the fastest is kept")
+    parser.add_argument("--max-slope", type=float, default=1.6,
+                        help="largest accepted log-log growth exponent (1 = linear, 2 = quadratic)")
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    stages = _legacy_stages() if args.legacy else _current_stages(args.budget)
+    results = run(sorted(args.sizes), stages, max(1, args.repeats))
+    report = {
+        "sizes": sorted(args.sizes),
+        "legacy": args.legacy,
+        "repeats": max(1, args.repeats),
+        "engines": {
+            "ner": engine_name(compile_linear(ner.PARTY_PATTERN, ignore_case=True)),
+            "clause_split": engine_name(compile_linear(clause_extractor.HEADING_SPLIT)),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+    if args.check:
+        # slopes of sub-10ms stages are timer noise; only judge stages that take measurable time
+        worst = [
+            (name, res["slope"]) for name, res in results.items()
+            if res["slope"] is not None and res["seconds"][-1] > 0.01 and res["slope"] > args.max_slope
+        ]
+        if worst:
+            print(f"Super-linear growth detected: {worst}", file=sys.stderr)
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
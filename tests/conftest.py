@@ -0,0 +1,5 @@
+from pathlib import Path
+import sys
+
+# make the project root importable so tests can `import core...` from any working directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,53 @@
+import pytest
+
+from core import charts
+from core.charts import ChartCache, bar_chart
+
+
+def test_cache_evicts_least_recently_used_to_stay_within_size():
+    cache = ChartCache(max_bytes=10)
+    cache.put(("a",), b"aaaa")
+    cache.put(("b",), b"bbbb")
+    assert cache.get(("a",)) == b"aaaa"  # "a" is now the most recently used
+    cache.put(("c",), b"cccc")
+
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == b"aaaa" and cache.get(("c",)) == b"cccc"
+    assert cache.stats() == {"entries": 2, "bytes": 8, "hits": 3, "misses": 1}
+
+
+def test_cache_skips_oversized_entries_and_replaces_in_place():
+    cache = ChartCache(max_bytes=10)
+    cache.put(("big",), b"x" * 11)
+    assert cache.get(("big",)) is None
+
+    cache.put(("k",), b"123456")
+    cache.put(("k",), b"12")
+    assert cache.stats()["bytes"] == 2
+    assert cache.get(("k",)) == b"12"
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
+
+
+def test_bar_chart_renders_once_per_key(monkeypatch):
+    calls = []
+    monkeypatch.setattr(charts, "_render_bar", lambda *args: calls.append(args) or b"png")
+    cache = ChartCache()
+    counts = {"High": 1, "Low": 2}
+    assert bar_chart(counts, "x", "y", cache=cache) == b"png"
+    assert bar_chart(dict(counts), "x", "y", cache=cache) == b"png"
+    assert len(calls) == 1
+    bar_chart(counts, "x", "y", fmt="svg", cache=cache)
+    assert len(calls) == 2
+    with pytest.raises(ValueError):
+        bar_chart(counts, "x", "y", fmt="gif", cache=cache)
+
+
+def test_rendering_registers_no_pyplot_figures():
+    plt = pytest.importorskip("matplotlib.pyplot")
+    plt.close("all")
+    for fmt in ("png", "svg"):
+        data = bar_chart({"High": 3, "Medium": 1, "Low": 0}, "Risk", "Count", fmt=fmt, cache=None)
+        assert data.startswith(b"\x89PNG") if fmt == "png" else b"<svg" in data
+    assert plt.get_fignums() == []
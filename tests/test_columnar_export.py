@@ -0,0 +1,118 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+
+from core.columnar_export import ColumnarExporter, clause_schema, document_schema, export_corpus
+
+DOCS = [
+    ("a.txt", "This Agreement is made between Alpha Ltd and Beta LLP.\n\n1. The Borrower shall repay the loan.\n2. The Supplier shall indemnify the Buyer for any breach."),
+    ("b.txt", "1. The Tenant is entitled to quiet enjoyment.\n2. The Landlord must not enter the premises."),
+]
+
+
+def _scan(path, table):
+    return ds.dataset(str(path / table), format="parquet", partitioning="hive").to_table()
+
+
+def test_schema_and_offsets(tmp_path):
+    stats = export_corpus(DOCS, tmp_path, partition="p1")
+    assert stats == {"documents": 2, "clauses": 5, "partition": "p1"}
+
+    clauses = _scan(tmp_path, "clauses")
+    docs = _scan(tmp_path, "documents")
+    assert clauses.schema.remove(clauses.schema.get_field_index("batch")) == clause_schema()
+    assert docs.schema.remove(docs.schema.get_field_index("batch")) == document_schema()
+
+    text = dict(DOCS)
+    for row in clauses.to_pylist():
+        assert text[row["doc_id"]][row["start"]:row["end"]] == row["text"]
+        assert row["rule_pack"]
+
+
+def test_composite_score_round_trips_exactly(tmp_path):
+    export_corpus(DOCS, tmp_path, partition="p1")
+    scores = {r["doc_id"]: r["composite_score"] for r in _scan(tmp_path, "documents").to_pylist()}
+    docs = dict(DOCS)
+    from core.columnar_export import analyze_document
+    for doc_id, score in scores.items():
+        assert score == analyze_document(doc_id, docs[doc_id])[0]["composite_score"]
+        assert score == round(score, 1)
+
+
+def test_runs_append_new_partitions(tmp_path):
+    export_corpus(DOCS[:1], tmp_path, partition="p1", batch_size=1)
+    export_corpus(DOCS[1:], tmp_path, partition="p2")
+    docs = _scan(tmp_path, "documents")
+    assert sorted(docs.column("batch").to_pylist()) == ["p1", "p2"]
+    assert _scan(tmp_path, "clauses").num_rows == 5
+
+
+def test_existing_partition_is_not_overwritten(tmp_path):
+    export_corpus(DOCS, tmp_path, partition="p1")
+    with pytest.raises(FileExistsError):
+        export_corpus(DOCS, tmp_path, partition="p1")
+
+
+def test_failed_run_publishes_nothing(tmp_path):
+    def docs():
+        yield DOCS[0]
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        export_corpus(docs(), tmp_path, partition="p1", batch_size=1)
+    for table in ("clauses", "documents"):
+        assert list((tmp_path / table).iterdir()) == []
+
+    # the partition id can be reused after a failed run
+    export_corpus(DOCS, tmp_path, partition="p1")
+    assert _scan(tmp_path, "documents").num_rows == 2
+
+
+def test_feather_output(tmp_path):
+    with ColumnarExporter(tmp_path, fmt="feather", partition="f1") as exporter:
+        for doc_id, text in DOCS:
+            exporter.add_document(doc_id, text)
+    table = feather.read_table(str(tmp_path / "clauses" / "batch=f1" / "part-00000.feather"))
+    assert table.schema == clause_schema()
+    assert table.num_rows == 5
+
+
+def test_export_scores_match_the_app(tmp_path):
+    from core.pipeline import MAX_SCORED_CLAUSES, analyze_contract
+    clauses = ["The Supplier shall indemnify the Buyer for any breach.", "The Tenant may renew the lease."]
+    # clauses past the scoring cap would pull the composite down if they were scored
+    text = "\n\n".join(f"{i + 1}. {clauses[i >= MAX_SCORED_CLAUSES or i % 2]}" for i in range(MAX_SCORED_CLAUSES + 100))
+    export_corpus([("long.txt", text)], tmp_path, partition="p1")
+
+    doc = _scan(tmp_path, "documents").to_pylist()[0]
+    expected = analyze_contract(text)
+    assert doc["composite_score"] == expected["composite_score"]
+    assert doc["num_clauses"] == expected["num_clauses"] == MAX_SCORED_CLAUSES + 100
+    assert doc["degraded_stages"] == []
+
+    rows = sorted(_scan(tmp_path, "clauses").to_pylist(), key=lambda r: r["clause_index"])
+    assert [r["risk_label"] for r in rows[:MAX_SCORED_CLAUSES]] == [s for _, s in expected["clauses_with_scores"]]
+    assert all(r["risk_label"] is None and r["severity"] is None for r in rows[MAX_SCORED_CLAUSES:])
+
+
+def test_rule_pack_level_names_and_exact_severity(tmp_path, monkeypatch):
+    from core import columnar_export
+    from core.risk_engine import score_clause
+    from core.rule_pack import DEFAULT_SOURCE, compile_pack, load_source, parse_artifact
+    source = load_source(DEFAULT_SOURCE)
+    names = {"High": "Critical", "Medium": "Major", "Low": "Minor"}
+    risk = source["risk"]
+    risk["levels"] = {names[k]: v for k, v in risk["levels"].items()}
+    risk["thresholds"] = {names[k]: v for k, v in risk["thresholds"].items()}
+    risk["base_label"] = names[risk["base_label"]]
+    pack = parse_artifact(compile_pack(source))
+    monkeypatch.setattr(columnar_export, "active_pack", lambda: pack)
+
+    export_corpus(DOCS, tmp_path, partition="p1")
+    for row in _scan(tmp_path, "clauses").to_pylist():
+        label, reasons = score_clause(row["text"], pack)
+        assert row["risk_label"] == label
+        assert row["severity"] == reasons["severity"]
+        assert dict(row["level_hits"]) == {n: reasons[n] for n in ("Critical", "Major", "Minor")}
@@ -0,0 +1,70 @@
+import sys
+
+import pytest
+
+import load_test
+from load_test import run_load
+
+MIX = {"small": (1, 1.0)}
+CORPUS = {"small": ["a", "b"]}
+
+
+def test_results_record_rule_packs_and_degraded_analyses():
+    results = iter([
+        {"rule_pack": "default@1", "degraded_stages": []},
+        {"rule_pack": "default@1", "degraded_stages": ["entities"]},
+        {"rule_pack": "default@2", "degraded_stages": ["entities", "clauses"]},
+        {"rule_pack": "default@2", "degraded_stages": []},
+    ])
+    out = run_load(lambda text: next(results), CORPUS, MIX, concurrency=1, requests=4, mem_interval=10)
+    assert out["rule_packs"] == {"default@1": 2, "default@2": 2}
+    assert out["degraded_results"] == 2
+    assert out["degraded_stages"] == {"entities": 2, "clauses": 1}
+
+
+def test_percentile_is_nearest_rank():
+    values = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert load_test.percentile([], 50) is None
+    assert load_test.percentile(values, 0) == 1.0
+    assert load_test.percentile(values, 50) == 3.0
+    assert load_test.percentile(values, 95) == 5.0
+    assert load_test.percentile(values, 100) == 5.0
+    assert load_test.percentile([7.0], 99) == 7.0
+
+
+def test_run_load_stats_with_stub_call(monkeypatch):
+    clock = {"now": 100.0}
+    monkeypatch.setattr(load_test.time, "perf_counter", lambda: clock["now"])
+    durations = iter([0.010, 0.020, 0.030, 0.040, 0.050])
+
+    def call(text):
+        d = next(durations)
+        clock["now"] += d
+        if d == 0.050:
+            raise TimeoutError("slow")
+        return {"rule_pack": "default@1", "degraded_stages": []}
+
+    out = run_load(call, CORPUS, MIX, concurrency=1, requests=5, mem_interval=10, memory_scope="client")
+    assert out["requests"] == 5
+    assert out["elapsed_s"] == 0.15
+    assert out["throughput_rps"] == round(5 / 0.15, 3)
+    assert out["error_rate"] == 0.2
+    assert out["errors"] == {"TimeoutError": 1}
+    assert out["latency"] == {"count": 4, "mean_ms": 25.0, "p50_ms": 20.0, "p95_ms": 40.0, "p99_ms": 40.0,
+                              "max_ms": 40.0}
+    assert out["latency_by_size"]["small"] == out["latency"]
+    assert out["memory"]["scope"] == "client"
+
+
+def test_parse_mix():
+    assert load_test._parse_mix("small=8:0.6, large=300:0.4") == {"small": (8, 0.6), "large": (300, 0.4)}
+
+
+@pytest.mark.parametrize("spec", ["small", "small=8", "small=8:x", "=8:1", "small=0:1", "small=8:0", "small=8:-1",
+                                  "small=8:nan", "a=1:1,a=2:1", "small=8:1,"])
+def test_malformed_mix_is_an_argparse_error(spec, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["load_test.py", "--mix", spec])
+    with pytest.raises(SystemExit) as exc:
+        load_test.main()
+    assert exc.value.code == 2
+    assert "argument --mix" in capsys.readouterr().err
@@ -0,0 +1,127 @@
+import json
+
+import pytest
+
+from core import rule_pack
+from core.risk_engine import score_clause
+from core.rule_pack import (CURRENT_NAME, DEFAULT_SOURCE, active_pack, build, compile_pack, load_source,
+                            normalize, parse_artifact, read_artifact)
+
+CLAUSE = "The Borrower shall pay a penalty of 5% per month on any overdue amount."
+
+
+def write_source(path, version="1.0.0", saturation_weight=None):
+    source = load_source(DEFAULT_SOURCE)
+    source["version"] = version
+    if saturation_weight is not None:
+        source["risk"]["saturation_weight"] = saturation_weight
+    path.write_text(json.dumps(source), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def no_reload_delay(monkeypatch):
+    monkeypatch.setattr(rule_pack, "RELOAD_INTERVAL", 0.0)
+
+
+def test_artifact_round_trip(tmp_path):
+    source = load_source(DEFAULT_SOURCE)
+    data = compile_pack(source)
+    pack = parse_artifact(data)
+    assert pack.rules == json.loads(json.dumps(normalize(source)))
+    assert pack.version.startswith(f"{source['name']}@{source['version']}+")
+
+    path = build(DEFAULT_SOURCE, tmp_path)
+    assert path.read_bytes() == data
+    assert (tmp_path / CURRENT_NAME).read_text(encoding="utf-8").strip() == path.name
+    assert read_artifact(path).version == pack.version
+    assert score_clause(CLAUSE, read_artifact(path)) == score_clause(CLAUSE, pack)
+
+
+def test_compiling_the_same_rules_twice_gives_the_same_artifact(tmp_path):
+    assert build(DEFAULT_SOURCE, tmp_path) == build(DEFAULT_SOURCE, tmp_path)
+    assert len(list(tmp_path.glob("*.crpk"))) == 1
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda d: d[:-1] + bytes([d[-1] ^ 1]),  # flipped payload bit
+    lambda d: d[:-10],                      # truncated payload
+    lambda d: b"XXXX" + d[4:],              # wrong magic
+    lambda d: d[:20],                       # truncated header
+])
+def test_damaged_artifact_is_rejected(corrupt):
+    with pytest.raises(ValueError):
+        parse_artifact(corrupt(compile_pack(load_source(DEFAULT_SOURCE))))
+
+
+def test_invalid_pattern_fails_at_compile_time():
+    source = load_source(DEFAULT_SOURCE)
+    source["obligations"]["Obligation"].append("(unclosed")
+    with pytest.raises(ValueError, match="invalid pattern"):
+        compile_pack(source)
+
+
+def test_hot_swap_keeps_old_pack_usable(tmp_path, no_reload_delay):
+    build_dir = tmp_path / "build"
+    build(write_source(tmp_path / "v1.json", "1.0.0"), build_dir)
+    old = active_pack(build_dir)
+    assert old.pack_version == "1.0.0"
+    assert active_pack(build_dir) is old
+    before = score_clause(CLAUSE, old)
+
+    v1_weight = load_source(DEFAULT_SOURCE)["risk"]["saturation_weight"]
+    build(write_source(tmp_path / "v2.json", "2.0.0", saturation_weight=v1_weight / 2), build_dir)
+    new = active_pack(build_dir)
+    assert new.pack_version == "2.0.0"
+    assert score_clause(CLAUSE, new) != before
+    # an analysis that started on the old pack finishes on it
+    assert score_clause(CLAUSE, old) == before
+
+
+def test_reload_waits_for_interval(tmp_path, monkeypatch):
+    monkeypatch.setattr(rule_pack, "RELOAD_INTERVAL", 3600.0)
+    build_dir = tmp_path / "build"
+    build(write_source(tmp_path / "v1.json", "1.0.0"), build_dir)
+    old = active_pack(build_dir)
+    build(write_source(tmp_path / "v2.json", "2.0.0"), build_dir)
+    assert active_pack(build_dir) is old
+
+
+def test_broken_artifact_is_ignored(tmp_path, no_reload_delay):
+    build_dir = tmp_path / "build"
+    build(write_source(tmp_path / "v1.json", "1.0.0"), build_dir)
+    old = active_pack(build_dir)
+
+    good = build(write_source(tmp_path / "v2.json", "2.0.0"), build_dir, activate=False)
+    broken = build_dir / "broken.crpk"
+    broken.write_bytes(good.read_bytes()[:-1] + b"!")
+    (build_dir / CURRENT_NAME).write_text("broken.crpk\n", encoding="utf-8")
+    assert active_pack(build_dir) is old
+
+
+def test_packs_are_tracked_per_build_dir(tmp_path, no_reload_delay):
+    build(write_source(tmp_path / "a.json", "1.0.0"), tmp_path / "a")
+    build(write_source(tmp_path / "b.json", "2.0.0"), tmp_path / "b")
+    assert active_pack(tmp_path / "a").pack_version == "1.0.0"
+    assert active_pack(tmp_path / "b").pack_version == "2.0.0"
+
+
+def test_source_is_used_until_an_artifact_is_built(tmp_path, no_reload_delay):
+    build_dir = tmp_path / "build"
+    source = write_source(tmp_path / "rules.json", "1.0.0")
+    assert active_pack(build_dir, source).pack_version == "1.0.0"
+    build(write_source(tmp_path / "v2.json", "2.0.0"), build_dir)
+    assert active_pack(build_dir, source).pack_version == "2.0.0"
+
+
+def test_missing_rules_raise_a_clear_error(tmp_path):
+    with pytest.raises(FileNotFoundError, match="No rule pack found"):
+        active_pack(tmp_path / "build", tmp_path / "missing.json")
+
+
+def test_yaml_source_compiles_like_json(tmp_path):
+    yaml = pytest.importorskip("yaml")
+    source = load_source(DEFAULT_SOURCE)
+    path = tmp_path / "rules.yaml"
+    path.write_text(yaml.safe_dump(source, sort_keys=False), encoding="utf-8")
+    assert compile_pack(load_source(path)) == compile_pack(source)
@@ -0,0 +1,71 @@
+import random
+import re
+import time
+
+import pytest
+
+from core import ner
+from core.ner import extract_entities
+from core.safe_regex import MAX_BLOCK_CHARS, MAX_MATCH_CHARS, StageBudget, compile_linear, finditer
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+NER_PATTERNS = [ner.AMOUNT_PATTERN, ner.DATE_PATTERN, ner.PARTY_PATTERN, ner.JURISDICTION_PATTERN]
+
+
+@pytest.mark.parametrize("pattern", NER_PATTERNS)
+def test_ner_matches_fit_in_window_overlap(pattern):
+    assert sre_parse.parse(pattern).getwidth()[1] <= MAX_MATCH_CHARS
+    assert MAX_BLOCK_CHARS > 2 * MAX_MATCH_CHARS
+
+
+@pytest.mark.parametrize("pattern", NER_PATTERNS)
+def test_windowed_scan_matches_whole_text_scan(pattern):
+    rng = random.Random(pattern)
+    words = ["between", "and", "Alpha Ltd", "Beta LLP", "governed by", "the laws of India", "Rs. 1,000",
+             "INR 25,000.50", "12/03/2024", "March 5, 2024", ",", ".", "\n", " " * 20, "x" * 300]
+    text = " ".join(rng.choice(words) for _ in range(3000))
+    compiled = compile_linear(pattern, ignore_case=True)
+    expected = [m.span() for m in compiled.finditer(text)]
+    windowed = [span for span, _ in finditer(compiled, text, max_block=1200, max_match=MAX_MATCH_CHARS)]
+    assert windowed == expected
+
+
+def test_long_line_does_not_truncate_jurisdiction():
+    text = "x" * 3985 + " governed by the laws of India, and more."
+    assert extract_entities(text)["JURISDICTION"] == ["the laws of India"]
+
+
+def test_match_across_window_cut_is_found_whole():
+    text = "a" * (MAX_BLOCK_CHARS - 20) + " between Alpha Ltd and Beta LLP."
+    assert extract_entities(text)["PARTIES"] == ["Alpha Ltd", "Beta LLP"]
+
+
+def test_plain_re_pattern_is_windowed_too():
+    compiled = re.compile(r"gov[a-z]{0,10} by")
+    text = ("y" * 997 + " governed by ") * 50
+    assert len(list(finditer(compiled, text, max_block=1100, max_match=20))) == 50
+
+
+def test_stage_budget_counts_cpu_time_not_waiting():
+    budget = StageBudget(0.05)
+    clock = budget.stage("entities")
+    time.sleep(0.2)
+    assert not clock.expired()
+    end = time.perf_counter() + 5
+    while not clock.expired() and time.perf_counter() < end:
+        pass
+    assert budget.degraded == {"entities": "CPU budget of 0.05s exceeded"}
+
+
+def test_stages_without_budget_run_to_completion():
+    text = "between a and b " * 30000 + "\n governed by the laws of India."
+    assert extract_entities(text)["JURISDICTION"] == ["the laws of India"]
+
+    budget = StageBudget(-1.0)  # already expired
+    partial = extract_entities(text, budget)
+    assert "entities" in budget.degraded
+    assert partial["JURISDICTION"] == []
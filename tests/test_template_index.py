@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from core.template_index import TemplateLibrary, _index_stamp, load_library
+
+DOC_A = """1. The Borrower shall repay the loan in sixty equal monthly instalments from the disbursement date.
+
+2. Interest shall accrue at twelve percent per annum on the outstanding principal amount.
+
+3. This Agreement shall be governed by the laws of India and the courts of Mumbai shall have jurisdiction.
+"""
+
+DOC_B = """1. Either party may terminate this Agreement by giving thirty days written notice to the other party.
+
+2. The Supplier shall keep all Confidential Information secret and shall not disclose it to any third party.
+"""
+
+
+def test_incremental_saves_load_consistently(tmp_path):
+    lib = TemplateLibrary()
+    assert lib.add_document(DOC_A, "a.txt") == 3
+    lib.save(tmp_path)
+
+    reloaded = TemplateLibrary.load(tmp_path)
+    assert reloaded.add_document(DOC_B, "b.txt") == 2
+    # clauses already in the saved index are not indexed twice
+    assert reloaded.add_document(DOC_A, "a-copy.txt") == 0
+    reloaded.save(tmp_path)
+
+    assert len(list(tmp_path.glob("signatures-*.npy"))) == 2
+    final = TemplateLibrary.load(tmp_path)
+    one_shot = TemplateLibrary()
+    one_shot.add_document(DOC_A, "a.txt")
+    one_shot.add_document(DOC_B, "b.txt")
+
+    assert final.records == one_shot.records
+    assert np.array_equal(final._signatures(), one_shot._signatures())
+    for rec in one_shot.records:
+        match, similarity = final.nearest(rec["text"])
+        assert match == rec and similarity == 1.0
+
+
+def test_save_without_new_clauses_writes_no_chunk(tmp_path):
+    lib = TemplateLibrary()
+    lib.add_document(DOC_A, "a.txt")
+    lib.save(tmp_path)
+    TemplateLibrary.load(tmp_path).save(tmp_path)
+    assert len(list(tmp_path.glob("signatures-*.npy"))) == 1
+
+
+def test_mismatched_chunks_and_records_are_rejected(tmp_path):
+    lib = TemplateLibrary()
+    lib.add_document(DOC_A, "a.txt")
+    lib.save(tmp_path)
+    with open(tmp_path / "clauses.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"text": "orphan clause", "source": "x"}\n')
+    with pytest.raises(ValueError):
+        TemplateLibrary.load(tmp_path)
+
+
+def test_load_library_is_cached_until_the_index_changes(tmp_path):
+    assert load_library(tmp_path) is None
+
+    lib = TemplateLibrary()
+    lib.add_document(DOC_A, "a.txt")
+    lib.save(tmp_path)
+    first = load_library(tmp_path)
+    assert len(first) == 3
+    assert load_library(tmp_path) is first
+
+    extra = TemplateLibrary.load(tmp_path)
+    extra.add_document(DOC_B, "b.txt")
+    extra.save(tmp_path)
+    second = load_library(tmp_path)
+    assert second is not first and len(second) == 5
+
+
+def test_save_leaves_no_temporary_files_and_noop_save_changes_nothing(tmp_path):
+    lib = TemplateLibrary()
+    lib.add_document(DOC_A, "a.txt")
+    lib.save(tmp_path)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["clauses.jsonl", "meta.json", "signatures-00000.npy"]
+
+    stamp = _index_stamp(tmp_path)
+    TemplateLibrary.load(tmp_path).save(tmp_path)
+    assert _index_stamp(tmp_path) == stamp
+
+
+def _append_partial_record(path):
+    with open(path / "clauses.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"text": "half a rec')
+
+
+@pytest.mark.parametrize("torn", [
+    lambda path: (path / "signatures-00001.npy").write_bytes(b""),  # chunk file still empty
+    lambda path: np.save(path / "signatures-00001.npy", np.zeros((2, 144), dtype=np.uint32)),  # clauses not appended yet
+    _append_partial_record,
+])
+def test_load_library_keeps_previous_version_when_caught_mid_save(tmp_path, torn):
+    lib = TemplateLibrary()
+    lib.add_document(DOC_A, "a.txt")
+    lib.save(tmp_path)
+    first = load_library(tmp_path)
+
+    torn(tmp_path)
+    assert load_library(tmp_path) is first